@@ -1,6 +1,6 @@
-"""Bard Configuration code for Tai AI, a self-evolving AI."""
-
-def speak(engine, text):
-    """Function to make Tai speak."""
-    engine.say(text)
+"""Bard Configuration code for Tai AI, a self-evolving AI."""
+
+def speak(engine, text):
+    """Function to make Tai speak."""
+    engine.say(text)
     engine.runAndWait()
\ No newline at end of file
@@ -1,196 +1,519 @@
-"""Blacksmith Configuration code for Tai AI, a self-evolving AI."""
-import google.generativeai as genai
-from typing import Optional, Union, List
-import sys
-import subprocess
-import requests
-from bs4 import BeautifulSoup
-import ast
-import json
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
-import re
-
-import brain.Historian as Historian
-from brain.Historian import format_memory
-
-def set_personality(model_name: str) -> genai.GenerativeModel:
-    """
-    Configures the Blacksmith AI model to interpret and act on requests
-    related to Python library management. Returns a model instance
-    that operates as 'Tai', with the sole purpose of generating shell
-    commands or Python code to install or manage libraries.
-    """
-    return genai.GenerativeModel(
-        model_name,
-        system_instruction=(
-            "You are 'Tai', an AI configuration focused exclusively on managing "
-            "Python libraries. You respond to user prompts by generating valid "
-            "Python code or shell commands (e.g., pip install) necessary to install, "
-            "upgrade, or verify libraries."
-            "Do not include explanations or comments. Only output the required code."
-            "If a library is already included in standard Python distributions, mention "
-            "no action is needed. Otherwise, assume the environment needs installation."
-        )
-    )
-
-def generate_content(model: genai.GenerativeModel, prompt: str, get_content: Optional[bool] = False) -> Union[str, genai.types.GenerateContentResponse]:
-    """
-    Generates installation code based on user prompts using the provided AI model.
-    
-    - Strips markdown formatting (like ```bash or ```python blocks).
-    - Ensures the response is clean, executable code.
-    - Designed to handle multiple libraries or instructions in a single prompt.
-
-    Args:
-        model (genai.GenerativeModel): The AI model instance to use.
-        prompt (str): The instruction given by the user.
-        get_content (Optional[bool], default=False): If True, returns the full content response.
-
-    Returns:
-        Union[str, genai.types.GenerateContentResponse]: The cleaned generated response as a string 
-        or the full response object if `get_content` is True.
-    """
-    content: genai.types.GenerateContentResponse = model.generate_content(prompt)
-    text = content.text.strip()
-
-    # Remove markdown code block markers
-    if text.startswith("```"):
-        text = text.split("\n", 1)[-1]
-    if text.endswith("```"):
-        text = text.rsplit("```", 1)[0].strip()
-
-    if not get_content:
-        return text
-    else:
-        return content
-
-
-def install_package(command: Union[str, List[str]]) -> None:
-    """
-    Installs a package using pip.
-
-    Parameters
-    ----------
-    command : str or List[str]
-        The command to install the package. If a string, it is split using
-        str.split(). If a list, it is not split. The command should not
-        include the "python -m" part.
-
-    Returns
-    -------
-    None
-    """
-    if isinstance(command, str):
-        command = command.split()
-    if "buildeasy" not in command:
-        subprocess.check_call([sys.executable, "-m"] + command)
-
-def clean_text(html: str) -> str:
-    """Cleans and extracts readable text from raw HTML using BeautifulSoup."""
-    soup = BeautifulSoup(html, "html.parser")
-    
-    # Remove unwanted elements
-    for tag in soup(["script", "style", "noscript", "iframe", "svg"]):
-        tag.decompose()
-    
-    # Get text and clean it up
-    text = soup.get_text(separator='\n')
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    cleaned = '\n'.join(lines)
-    
-    # Collapse multiple newlines
-    return re.sub(r'\n+', '\n', cleaned)
-
-def scroll_to_bottom(page):
-    """Scrolls to the bottom of the page to trigger lazy-loaded content."""
-    page.evaluate("""
-        () => {
-            return new Promise((resolve) => {
-                let totalHeight = 0;
-                const distance = 500;
-                const timer = setInterval(() => {
-                    window.scrollBy(0, distance);
-                    totalHeight += distance;
-                    if (totalHeight >= document.body.scrollHeight) {
-                        clearInterval(timer);
-                        resolve();
-                    }
-                }, 200);
-            });
-        }
-    """)
-
-def scrape_text(url: str, timeout: int = 15000) -> str:
-    """
-    Scrapes and cleans text from a URL using a headless browser (Playwright).
-    
-    Parameters
-    ----------
-    url : str
-        The URL to scrape text from.
-    timeout : int
-        Timeout in milliseconds for loading the page.
-    
-    Returns
-    -------
-    str
-        The cleaned, readable text content of the page.
-    """
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/113.0.0.0 Safari/537.36"
-            ))
-            page = context.new_page()
-            page.goto(url, timeout=timeout)
-            page.wait_for_load_state("networkidle", timeout=timeout)
-            scroll_to_bottom(page)  # Useful for dynamic/lazy-loaded content
-            content = page.content()
-            browser.close()
-            
-        return clean_text(content)
-    
-    except PlaywrightTimeoutError:
-        return "Error: Page load timed out."
-    except Exception as e:
-        return f"Unexpected error occurred: {str(e)}"
-
-def scrape_text_from_url(MODEL, glob, temp_mem, user_message: str) -> str:
-    memory_context = ""
-    if glob:
-        memory_context += f"\n## Global Memory:\n```\n{format_memory(json.loads(glob), 'global')}\n```\n"
-    if temp_mem:
-        memory_context += f"\n## Restricted Memory:\n```\n{format_memory(json.loads(temp_mem), 'restricted')}\n```\n"
-    model = genai.GenerativeModel(MODEL, system_instruction=f"""
-# Hello, simply read the below prompt and consider memory (relavant links by conversation's current topic), and find links (if any), and return the links in a pythonic list but without `variable_name = `. If there are no links return 'None'. **DO NOT** include duplicates.
-# Memory below
-{memory_context}
-    """)
-    
-    urls_str: str = f"{model.generate_content(user_message).text}"
-    
-    #print(urls_str)
-
-    final_text = ""
-
-    if urls_str.strip() != "None":
-        try:
-            urls = ast.literal_eval(urls_str)
-        except Exception as e:
-            return f"Error parsing links: {e}"
-
-        for url in urls:
-            try:
-                response = scrape_text(url)
-
-                final_text = f"{final_text}\n# {url}\n{response}"
-            except requests.RequestException as e:
-                return f"Request error: {e}"
-            except Exception as e:
-                return f"An error occurred: {e}"
-
-    #print(f"final_text: {final_text}")
-    return final_text
\ No newline at end of file
+"""Blacksmith Configuration code for Tai AI, a self-evolving AI."""
+import google.generativeai as genai
+from typing import Optional, Union, List
+import sys
+import subprocess
+import requests
+from lxml import etree
+import ast
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+import re
+import time
+import asyncio
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, Future, wait as wait_futures
+from requests.adapters import HTTPAdapter
+
+import brain.Historian as Historian
+from brain.Historian import format_memory
+from brain.retrieval import MemoryRetriever, entry_text
+from brain.memory_store import MemoryStore
+from brain.browser_pool import browser_pool, DEFAULT_USER_AGENT
+from brain.scrape_cache import ScrapeCache, CachedPage
+from brain.links import URL_PATTERN, MEMORY_LINK_HINTS, extract_urls
+from brain.config import SCRAPE_TIMEOUT_MS, SCRAPE_DEADLINE, SCRAPE_CACHE_PATH, SCRAPE_CACHE_MAX_BYTES, SCRAPE_CACHE_TTL, STATIC_FETCH_ENABLED, STATIC_MIN_TEXT_CHARS, SCRAPE_MAX_CHARS, SCRAPE_MAIN_CONTENT_ONLY, SCROLL_BUDGET_MS, SCROLL_SETTLE_MS, SCROLL_RULES, MEMORY_TOP_K, MEMORY_RECENT_WINDOW
+
+scrape_cache = ScrapeCache(SCRAPE_CACHE_PATH, max_bytes=SCRAPE_CACHE_MAX_BYTES, default_ttl=SCRAPE_CACHE_TTL)
+
+# Keep-alive connections shared by every static fetch
+http_session = requests.Session()
+http_session.headers.update({"User-Agent": DEFAULT_USER_AGENT, "Accept": "text/html,application/xhtml+xml,text/plain;q=0.9,*/*;q=0.8"})
+http_session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+http_session.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
+def set_personality(model_name: str) -> genai.GenerativeModel:
+    """
+    Configures the Blacksmith AI model to interpret and act on requests
+    related to Python library management. Returns a model instance
+    that operates as 'Tai', with the sole purpose of generating shell
+    commands or Python code to install or manage libraries.
+    """
+    return genai.GenerativeModel(
+        model_name,
+        system_instruction=(
+            "You are 'Tai', an AI configuration focused exclusively on managing "
+            "Python libraries. You respond to user prompts by generating valid "
+            "Python code or shell commands (e.g., pip install) necessary to install, "
+            "upgrade, or verify libraries."
+            "Do not include explanations or comments. Only output the required code."
+            "If a library is already included in standard Python distributions, mention "
+            "no action is needed. Otherwise, assume the environment needs installation."
+        )
+    )
+
+def generate_content(model: genai.GenerativeModel, prompt: str, get_content: Optional[bool] = False) -> Union[str, genai.types.GenerateContentResponse]:
+    """
+    Generates installation code based on user prompts using the provided AI model.
+    
+    - Strips markdown formatting (like ```bash or ```python blocks).
+    - Ensures the response is clean, executable code.
+    - Designed to handle multiple libraries or instructions in a single prompt.
+
+    Args:
+        model (genai.GenerativeModel): The AI model instance to use.
+        prompt (str): The instruction given by the user.
+        get_content (Optional[bool], default=False): If True, returns the full content response.
+
+    Returns:
+        Union[str, genai.types.GenerateContentResponse]: The cleaned generated response as a string 
+        or the full response object if `get_content` is True.
+    """
+    content: genai.types.GenerateContentResponse = model.generate_content(prompt)
+    text = content.text.strip()
+
+    # Remove markdown code block markers
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1]
+    if text.endswith("```"):
+        text = text.rsplit("```", 1)[0].strip()
+
+    if not get_content:
+        return text
+    else:
+        return content
+
+
+def install_package(command: Union[str, List[str]]) -> None:
+    """
+    Installs a package using pip.
+
+    Parameters
+    ----------
+    command : str or List[str]
+        The command to install the package. If a string, it is split using
+        str.split(). If a list, it is not split. The command should not
+        include the "python -m" part.
+
+    Returns
+    -------
+    None
+    """
+    if isinstance(command, str):
+        command = command.split()
+    if "buildeasy" not in command:
+        subprocess.check_call([sys.executable, "-m"] + command)
+
+# === Text Extraction ===
+
+SKIP_TAGS = {"script", "style", "noscript", "iframe", "svg", "template", "canvas"}
+CHROME_TAGS = {"nav", "header", "footer", "aside", "form"}  # dropped in main-content mode
+MAIN_TAGS = {"main", "article"}
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "details", "div", "dl", "dt",
+    "figcaption", "figure", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr",
+    "li", "main", "nav", "ol", "p", "pre", "section", "summary", "table", "td", "th", "tr", "ul"
+}
+CLEAN_CHUNK_SIZE = 64 * 1024
+
+class TextExtractor:
+    """
+    lxml parser target that collects readable text while the HTML is parsed,
+    without building a tree. Skipped elements (scripts, styles, SVG, ...) are
+    ignored as they stream past, and `done` is set once `max_chars` of text has
+    been collected so the caller can stop feeding the parser.
+    """
+
+    def __init__(self, main_only: bool = False, max_chars: Optional[int] = None):
+        self.main_only = main_only
+        self.max_chars = max_chars
+        self.done = False
+        self._stack: List[tuple] = []
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._seen_main = False
+        self._parts = {"all": [], "main": []}
+        self._chars = {"all": 0, "main": 0}
+
+    def _add(self, text: str) -> None:
+        targets = ["all"] + (["main"] if self._main_depth else [])
+        for name in targets:
+            if self.max_chars is None or self._chars[name] < self.max_chars:
+                self._parts[name].append(text)
+                self._chars[name] += len(text)
+
+        if self.max_chars is not None:
+            if self.main_only:
+                self.done = self._chars["main"] >= self.max_chars
+            else:
+                self.done = self._chars["all"] >= self.max_chars
+
+    def start(self, tag, attrib):
+        tag = tag.lower() if isinstance(tag, str) else ""
+        skip = tag in SKIP_TAGS or (self.main_only and not self._main_depth and tag in CHROME_TAGS)
+        main = tag in MAIN_TAGS or attrib.get("role") == "main"
+        self._stack.append((skip, main))
+        self._skip_depth += skip
+        self._main_depth += main
+        self._seen_main = self._seen_main or main
+        if tag in BLOCK_TAGS:
+            self._add("\n")
+
+    def end(self, tag):
+        if not self._stack:
+            return
+        skip, main = self._stack.pop()
+        self._skip_depth -= skip
+        self._main_depth -= main
+        if isinstance(tag, str) and tag.lower() in BLOCK_TAGS:
+            self._add("\n")
+
+    def data(self, data):
+        if not self._skip_depth and not self.done:
+            self._add(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self) -> str:
+        name = "main" if self.main_only and self._seen_main and self._chars["main"] else "all"
+        lines = (" ".join(line.split()) for line in "".join(self._parts[name]).splitlines())
+        text = "\n".join(line for line in lines if line)
+        return text[:self.max_chars] if self.max_chars is not None else text
+
+def clean_text(html: str, main_only: bool = SCRAPE_MAIN_CONTENT_ONLY, max_chars: Optional[int] = SCRAPE_MAX_CHARS) -> str:
+    """
+    Cleans and extracts readable text from raw HTML.
+
+    The HTML is streamed through lxml in chunks and text is collected on the fly,
+    so parsing stops as soon as `max_chars` of text has been read. With `main_only`,
+    only text inside <main>/<article> is kept (falling back to the whole page if
+    it has neither), and navigation, headers, footers and sidebars are dropped.
+    """
+    extractor = TextExtractor(main_only=main_only, max_chars=max_chars)
+    parser = etree.HTMLParser(target=extractor, remove_comments=True)
+    for offset in range(0, len(html), CLEAN_CHUNK_SIZE):
+        parser.feed(html[offset:offset + CLEAN_CHUNK_SIZE])
+        if extractor.done:
+            break
+    try:
+        return parser.close()
+    except etree.XMLSyntaxError:
+        return extractor.close()
+
+def scroll_mode_for(url: str) -> str:
+    """Returns the scroll mode for a URL's domain from SCROLL_RULES, defaulting to 'adaptive'."""
+    host = (urlsplit(url).hostname or "").lower()
+    while host:
+        if host in SCROLL_RULES:
+            return SCROLL_RULES[host]
+        host = host.partition(".")[2]
+    return "adaptive"
+
+async def scroll_to_bottom(page, budget_ms: int = SCROLL_BUDGET_MS, settle_ms: int = SCROLL_SETTLE_MS):
+    """
+    Scrolls to the bottom of the page to trigger lazy-loaded content.
+
+    Scrolls a screen at a time and stops as soon as the bottom is reached and the
+    DOM has stopped changing for `settle_ms` (watched with a MutationObserver), or
+    when `budget_ms` runs out, so infinite-scroll pages cannot hang the scrape.
+    """
+    await page.evaluate("""
+        ([budgetMs, settleMs]) => {
+            return new Promise((resolve) => {
+                const start = performance.now();
+                let lastChange = start - settleMs;  // a page that fits on screen finishes at once
+                const observer = new MutationObserver(() => { lastChange = performance.now(); });
+                observer.observe(document.documentElement, { childList: true, subtree: true });
+
+                const finish = () => {
+                    observer.disconnect();
+                    clearInterval(timer);
+                    resolve();
+                };
+                const timer = setInterval(() => {
+                    const now = performance.now();
+                    const scroller = document.scrollingElement || document.documentElement;
+                    const atBottom = window.innerHeight + window.scrollY >= scroller.scrollHeight - 2;
+                    if (now - start >= budgetMs || (atBottom && now - lastChange >= settleMs)) {
+                        finish();
+                        return;
+                    }
+                    if (!atBottom) {
+                        window.scrollBy(0, window.innerHeight);
+                    }
+                }, 100);
+            });
+        }
+    """, [budget_ms, settle_ms])
+
+async def load_page(page, url: str, timeout: int) -> tuple:
+    """Loads `url` into a pooled page and returns its rendered HTML, HTTP status and response headers."""
+    response = await page.goto(url, timeout=timeout)
+    await page.wait_for_load_state("networkidle", timeout=timeout)
+    if scroll_mode_for(url) != "skip":
+        await scroll_to_bottom(page)  # Useful for dynamic/lazy-loaded content
+    status = response.status if response is not None else 200
+    headers = response.headers if response is not None else {}
+    return await page.content(), status, headers
+
+# Markers of pages that render their content with JavaScript
+JS_RENDERED_MARKERS = re.compile(
+    r"""<div[^>]+id=["'](?:root|app|__next|__nuxt)["'][^>]*>\s*</div>"""
+    r"|<noscript>[^<]*(?:enable|requires?)\s+javascript",
+    re.IGNORECASE
+)
+
+def looks_js_rendered(html: str, text: str) -> bool:
+    """Guesses whether static HTML is missing content that a browser would render."""
+    if len(text) < STATIC_MIN_TEXT_CHARS:
+        return True
+    return bool(JS_RENDERED_MARKERS.search(html)) and len(text) < STATIC_MIN_TEXT_CHARS * 10
+
+def fetch_static(url: str, timeout: int, cached: Optional[CachedPage] = None) -> Optional[str]:
+    """
+    Fetches `url` with a plain HTTP GET over the shared keep-alive session.
+
+    A stale cached entry is revalidated with its ETag/Last-Modified, so an unchanged
+    page costs a 304. Returns the cleaned text, or None if the page has to be
+    rendered in the browser (request failed, error status, or JS-rendered HTML).
+    """
+    headers = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    try:
+        response = http_session.get(url, headers=headers, timeout=timeout / 1000, stream=True)
+    except requests.RequestException:
+        return None
+
+    with response:
+        if response.status_code == 304 and cached is not None:
+            scrape_cache.refresh(url, response.headers)
+            return cached.text
+        if response.status_code >= 400:
+            return None
+
+        content_type = response.headers.get("Content-Type", "").lower()
+        try:
+            if "html" in content_type:
+                text = clean_text(response.text)
+                if looks_js_rendered(response.text, text):
+                    return None
+            elif content_type.startswith("text/") or "json" in content_type:
+                text = read_text(response)
+            else:
+                return None
+        except requests.RequestException:
+            return None
+
+    scrape_cache.put(url, text, response.headers)
+    return text
+
+def read_text(response: requests.Response, max_chars: Optional[int] = SCRAPE_MAX_CHARS) -> str:
+    """
+    Reads a plain-text or JSON body from a streamed response, stopping once
+    `max_chars` characters have been read so large files are not downloaded in full.
+    """
+    if response.encoding is None:
+        response.encoding = "utf-8"
+    parts = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=CLEAN_CHUNK_SIZE, decode_unicode=True):
+        parts.append(chunk)
+        size += len(chunk)
+        if max_chars is not None and size >= max_chars:
+            break
+    text = "".join(parts).strip()
+    return text[:max_chars] if max_chars is not None else text
+
+def scrape_texts(urls: List[str], timeout: int = SCRAPE_TIMEOUT_MS, deadline: Optional[float] = SCRAPE_DEADLINE, force_refresh: bool = False) -> List[str]:
+    """
+    Scrapes several URLs concurrently.
+
+    Each URL goes through up to three tiers, stopping at the first that yields text:
+    the scrape cache (if still fresh), a plain HTTP GET, and finally a page from the
+    shared browser pool for pages that need JavaScript to render.
+
+    Parameters
+    ----------
+    urls : List[str]
+        The URLs to scrape text from.
+    timeout : int
+        Timeout in milliseconds for each URL and tier, covering load, network idle and scrolling.
+    deadline : Optional[float]
+        Overall time limit in seconds. URLs still loading when it passes are cancelled.
+    force_refresh : bool
+        If True, ignores cached pages and scrapes every URL again.
+
+    Returns
+    -------
+    List[str]
+        The cleaned text of each page, in the same order as `urls`. A URL that
+        failed or ran out of time gets an error message instead of its text.
+    """
+    start_time = time.time()
+
+    def loader(url: str):
+        async def load(page):
+            return await asyncio.wait_for(load_page(page, url, timeout), timeout / 1000)
+        return load
+
+    expired = threading.Event()
+
+    def fetch(url: str, cached: Optional[CachedPage]) -> Union[str, Future, None]:
+        # Returns the text, or a browser pool future if the page needs rendering
+        if STATIC_FETCH_ENABLED:
+            text = fetch_static(url, timeout, cached)
+            if text is not None:
+                return text
+        if expired.is_set():
+            return None
+        return browser_pool.submit(loader(url))
+
+    results: List[Optional[str]] = [None] * len(urls)
+    pending = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, min(8, len(urls))))
+    for index, url in enumerate(urls):
+        cached = None if force_refresh else scrape_cache.get(url)
+        if cached is not None and cached.is_fresh():
+            results[index] = cached.text
+        else:
+            pending[index] = executor.submit(fetch, url, cached)
+    wait_futures(list(pending.values()), timeout=deadline)
+    expired.set()  # anything still running has missed the deadline; don't start its browser load
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    browser_futures = {}
+    for index, future in pending.items():
+        if not future.done():
+            results[index] = "Error: Scrape deadline exceeded."
+            continue
+        try:
+            outcome = future.result()
+        except Exception as e:
+            results[index] = f"Unexpected error occurred: {str(e)}"
+            continue
+        if isinstance(outcome, Future):
+            browser_futures[index] = outcome
+        else:
+            results[index] = outcome if outcome is not None else "Error: Scrape deadline exceeded."
+
+    remaining = None if deadline is None else max(0, deadline - (time.time() - start_time))
+    wait_futures(list(browser_futures.values()), timeout=remaining)
+
+    for index, future in browser_futures.items():
+        if not future.done():
+            future.cancel()
+            results[index] = "Error: Scrape deadline exceeded."
+            continue
+        try:
+            html, status, headers = future.result()
+            text = clean_text(html)
+            if status < 400:
+                scrape_cache.put(urls[index], text, headers)
+            results[index] = text
+        except (PlaywrightTimeoutError, asyncio.TimeoutError):
+            results[index] = "Error: Page load timed out."
+        except Exception as e:
+            results[index] = f"Unexpected error occurred: {str(e)}"
+    return results
+
+def scrape_text(url: str, timeout: int = SCRAPE_TIMEOUT_MS, force_refresh: bool = False) -> str:
+    """
+    Scrapes and cleans text from a URL. Static pages are fetched over plain HTTP;
+    pages that need JavaScript are rendered with a headless browser (Playwright)
+    borrowed from the shared browser pool.
+    
+    Parameters
+    ----------
+    url : str
+        The URL to scrape text from.
+    timeout : int
+        Timeout in milliseconds for loading the page.
+    force_refresh : bool
+        If True, ignores the scrape cache.
+    
+    Returns
+    -------
+    str
+        The cleaned, readable text content of the page.
+    """
+    return scrape_texts([url], timeout=timeout, deadline=None, force_refresh=force_refresh)[0]
+
+# === Link Extraction ===
+
+# Separate from Historian's retrievers: these only index the entries that contain links
+link_retrievers = {"global": MemoryRetriever(), "restricted": MemoryRetriever()}
+
+def has_links(memory: MemoryStore) -> bool:
+    return any(URL_PATTERN.search(entry_text(entry)) for entry in memory)
+
+def linked_memory(memory: MemoryStore, memory_type: str, user_message: str) -> list:
+    """Returns the newest memory entries containing links plus the linked entries most relevant to the message."""
+    linked = [entry for entry in memory if URL_PATTERN.search(entry_text(entry))]
+    return link_retrievers[memory_type].select(linked, user_message, MEMORY_TOP_K, MEMORY_RECENT_WINDOW, memory)
+
+def resolve_memory_urls(MODEL, glob, temp_mem, user_message: str) -> List[str]:
+    """Asks the model which links from memory the message refers to."""
+    memory_context = ""
+    if glob:
+        memory_context += f"\n## Global Memory:\n```\n{format_memory(linked_memory(glob, 'global', user_message), 'global')}\n```\n"
+    if temp_mem:
+        memory_context += f"\n## Restricted Memory:\n```\n{format_memory(linked_memory(temp_mem, 'restricted', user_message), 'restricted')}\n```\n"
+    model = genai.GenerativeModel(MODEL, system_instruction=f"""
+# Hello, simply read the below prompt and consider memory (relavant links by conversation's current topic), and find links (if any), and return the links in a pythonic list but without `variable_name = `. If there are no links return 'None'. **DO NOT** include duplicates.
+# Memory below
+{memory_context}
+    """)
+    
+    urls_str: str = f"{model.generate_content(user_message).text}"
+    if urls_str.strip() == "None":
+        return []
+    urls = ast.literal_eval(urls_str)
+    return [url for url in urls if isinstance(url, str)]
+
+def find_urls(MODEL, glob, temp_mem, user_message: str) -> List[str]:
+    """
+    Returns the URLs a message asks Tai to read.
+
+    Explicit URLs are found locally. The model is only consulted when the message
+    refers back to a link ("that link", "the docs you sent", ...) and memory
+    actually contains links to resolve it against.
+    """
+    urls = extract_urls(user_message)
+    if MEMORY_LINK_HINTS.search(user_message) and (has_links(glob) or has_links(temp_mem)):
+        try:
+            memory_urls = resolve_memory_urls(MODEL, glob, temp_mem, user_message)
+        except Exception as e:
+            # The explicit URLs are still worth scraping
+            print(f"[Blacksmith] Could not resolve links from memory: {e}")
+            memory_urls = []
+        for url in memory_urls:
+            if url not in urls:
+                urls.append(url)
+    return urls
+
+def scrape_text_from_url(MODEL, glob, temp_mem, user_message: str, force_refresh: bool = False) -> str:
+    if isinstance(user_message, dict):
+        user_message = user_message.get("text", "")
+    if not isinstance(user_message, str):
+        return ""
+
+    final_text = ""
+
+    try:
+        urls = find_urls(MODEL, glob, temp_mem, user_message)
+    except Exception as e:
+        return f"Error parsing links: {e}"
+
+    if urls:
+        start_time = time.time()
+        for url, response in zip(urls, scrape_texts(urls, force_refresh=force_refresh)):
+            final_text = f"{final_text}\n# {url}\n{response}"
+        print("[Blacksmith] Scraped {} link(s). (Time: {:.2f} seconds)".format(len(urls), time.time() - start_time))
+
+    return final_text
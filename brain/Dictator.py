@@ -1,327 +1,445 @@
-import google.generativeai as genai
-import threading
-import json
-import pyttsx3
-import re
-from datetime import datetime
-from typing import Union, List
-import brain.Blacksmith as Blacksmith
-from brain.Blacksmith import scrape_text_from_url
-import brain.Architect as Architect
-from brain.Architect import generate_code
-import brain.Historian as Historian
-from brain.Historian import save_memory, load_memory, format_memory, update_memory
-import brain.Seer as Seer
-from brain.Seer import process_image_bytes, safe_unicode
-from brain.Bard import speak
-from brain.config import MODEL, temp_mem, glob, SPEAKER_MODE, init_documentation, initial_documentation, followup_documentation, IS_ENCRYPTED, is_typing
-from buildeasy import Adaptor
-from brain.gitbase_launcher import NotificationManager
-from PIL import Image
-import tkinter as tk
-from tkinter import filedialog
-import time
-
-# Initialize notifications and altcolor
-NotificationManager.hide()
-start_time_outer = time.time()
-import pygame
-import pygame_gui
-import altcolor
-altcolor.init(show_credits=False)
-end_time_outer = time.time()
-NotificationManager.show()
-print(f"[UI] AltColor & PyGame initialized. (Time: {end_time_outer - start_time_outer} seconds)")
-
-# Initialize pyttsx3 engine
-engine = pyttsx3.init()
-
-def setup_models():
-    """
-    Initializes all models and starts them in separate threads. This function
-    is blocking and will not return until all models are ready.
-
-    The models are:
-        - Architect: generates code
-        - Historian: manages memory
-        - Blacksmith: generates shell commands
-        - Seer: processes images
-
-    The function prints a message when each model is ready and a final message
-    when all models are ready.
-    """
-    global architect_model, historian_model, blacksmith_model, seer_model
-
-    start_time = time.time()
-    def set_architect():
-        global architect_model
-        architect_model = Architect.set_personality(MODEL)
-        print("[Setup] Architect model ready")
-
-    def set_historian():
-        global historian_model
-        historian_model = Historian.set_personality(MODEL)
-        print("[Setup] Historian model ready")
-
-    def set_blacksmith():
-        global blacksmith_model
-        blacksmith_model = Blacksmith.set_personality(MODEL)
-        print("[Setup] Blacksmith model ready")
-
-    def set_vision():
-        global seer_model
-        seer_model = Seer.set_personality(MODEL)
-        print("[Setup] Seer model ready")
-
-    threads = [
-        threading.Thread(target=set_architect),
-        threading.Thread(target=set_historian),
-        threading.Thread(target=set_blacksmith),
-        threading.Thread(target=set_vision)
-    ]
-
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
-
-    end_time = time.time()
-    print("[Setup] All models initialized. (Time: {:.2f} seconds)".format(end_time - start_time))
-
-def init(model_name: str) -> genai.GenerativeModel:
-    start_time = time.time()
-    setup_models()
-    m = genai.GenerativeModel(
-        model_name,
-        system_instruction=(f"{init_documentation}")
-    )
-    end_time = time.time()
-    print("[UI] Model initialized. (Time: {:.2f} seconds)".format(end_time - start_time))
-    return m
-
-
-def typing_indicator(chat_display: pygame_gui.elements.UITextBox, send_button: pygame_gui.elements.UIButton):
-    global base_text
-    dots = ["...", "..", ".", ""]
-    index = 0
-    base_text = chat_display.html_text
-    while is_typing:
-        new_text = f"{base_text}\nTai is thinking{dots[index]}"
-        chat_display.set_text(new_text)
-        index = (index + 1) % len(dots)
-        time.sleep(0.5)
-
-
-def send_message(user_message: Union[str, bytes], model: genai.GenerativeModel, manager: pygame_gui.UIManager, chat_display: pygame_gui.elements.UITextBox, send_button: pygame_gui.elements.UIButton):
-    global temp_mem, SPEAKER_MODE, is_typing, base_text
-    old_text = chat_display.html_text
-
-    image_summary = ""
-    image_vision_results = {}
-
-    start_time_mesgreader = time.time()
-    if isinstance(user_message, dict):
-        user_text = user_message.get("text", "").strip()
-        user_image = user_message.get("image", None)
-
-        if user_image:
-            image_vision_results = process_image_bytes(seer_model, user_image)
-            image_summary = (
-                f"\n### 🖼️ **Image Analysis**\n"
-                f"- **Description**: {image_vision_results.get('description', 'N/A')}\n"
-                f"- **Objects**: {image_vision_results.get('objects', 'N/A')}\n"
-                f"- **OCR Text**: {image_vision_results.get('ocr_text', 'N/A')}\n"
-                f"- **Emotions**: {image_vision_results.get('emotions', 'N/A')}\n"
-                f"- **Suggestions**: {image_vision_results.get('suggestions', 'N/A')}\n"
-            )
-    else:
-        user_text = user_message if isinstance(user_message, str) else ""
-        if isinstance(user_message, bytes):
-            image_vision_results = process_image_bytes(seer_model, user_message)
-            image_summary = (
-                f"\n### 🖼️ **Image Analysis**\n"
-                f"- **Description**: {image_vision_results.get('description', 'N/A')}\n"
-                f"- **Objects**: {image_vision_results.get('objects', 'N/A')}\n"
-                f"- **OCR Text**: {image_vision_results.get('ocr_text', 'N/A')}\n"
-                f"- **Emotions**: {image_vision_results.get('emotions', 'N/A')}\n"
-                f"- **Suggestions**: {image_vision_results.get('suggestions', 'N/A')}\n"
-            )
-    end_time_mesgreader = time.time()
-    print("[UI] Message reader finished. (Time: {:.2f} seconds)".format(end_time_mesgreader - start_time_mesgreader))
-    
-    start_time_display = time.time()
-    if isinstance(user_message, dict):
-        display_text = user_message.get("text", "").strip()
-        if user_message.get("image"):
-            display_text += "\n[Image Uploaded]"
-    elif isinstance(user_message, str):
-        display_text = user_message.strip()
-    elif isinstance(user_message, bytes):
-        display_text = "[Image Uploaded]"
-    else:
-        display_text = "[Unrecognized input]"
-    
-    end_time_display = time.time()
-    print("[UI] Display updated. (Time: {:.2f} seconds)".format(end_time_display - start_time_display))
-    
-    chat_display.set_text(
-        chat_display.html_text +
-        f'<font color="blue">You:</font> {display_text}<br>'
-    )
-    
-    # Thread typing loop
-    is_typing = True
-    send_button.disable()  # Disable the send button while typing
-    typing_thread = threading.Thread(target=typing_indicator, args=(chat_display, send_button,))
-    typing_thread.start()
-
-    memory_context = ""
-    if glob:
-        memory_context += f"\n##### Global Memory:\n```\n{format_memory(json.loads(glob), 'global')}\n```\n"
-    if temp_mem:
-        memory_context += f"\n##### Restricted Memory:\n```\n{format_memory(json.loads(temp_mem), 'restricted')}\n```\n"
-
-    start_time_pompt = time.time()
-    initial_prompt = f"{initial_documentation(memory_context, user_message, image_summary)}"
-    initial_model_response = model.generate_content(initial_prompt)
-    end_time_prompt = time.time()
-    print("[UI] Prompt sent to model. (Time: {:.2f} seconds)".format(end_time_prompt - start_time_pompt))
-
-    parsed_response_text = ""
-    start_time_scrape = time.time()
-    scraped_text: Union[str, None] = scrape_text_from_url(MODEL, glob, temp_mem, user_message)
-    end_time_scrape = time.time()
-    print("[UI] Text scraping finished. (Time: {:.2f} seconds)".format(end_time_scrape - start_time_scrape))
-
-    start_time_response = time.time()
-    response_text, upgraded_code = generate_code(
-        blacksmith_model=blacksmith_model,
-        architect_model=architect_model,
-        user_request=user_message,
-        response=initial_model_response.text,
-        tai=model
-    )
-    end_time_response = time.time()
-    print("[UI] Response generation finished. (Time: {:.2f} seconds)".format(end_time_response - start_time_response))
-
-    start_time_responsecleaner = time.time()
-    if '_+_TaiEvolutionTransformer_+_' in initial_model_response.text:
-        parsed_response_text = initial_model_response.text.split('_+_TaiEvolutionTransformer_+_')[1].strip()
-        Adaptor.modify('brain.modifiable', upgraded_code)
-    else:
-        parsed_response_text = initial_model_response.text
-        upgraded_code = None
-
-    followup_prompt = f"{followup_documentation(user_message, parsed_response_text, memory_context, upgraded_code, scraped_text)}"
-    final_model_response = model.generate_content(followup_prompt)
-    raw_final_response = final_model_response.text
-
-    cleaned_response = re.sub(r'<[^>]+>.*?</[^>]+>', '', raw_final_response, flags=re.DOTALL)
-    cleaned_response = cleaned_response.replace("```xml", "").replace("```", "").strip()
-    end_time_responsecleaner = time.time()
-    print("[UI] Response cleaner finished. (Time: {:.2f} seconds)".format(end_time_responsecleaner - start_time_responsecleaner))
-
-    start_time_memoryupdate = time.time()
-    if re.search(r'<GlobalMemory>.*?</GlobalMemory>', raw_final_response) or \
-       re.search(r'<Forget>.*?</Forget>', raw_final_response):
-        update_memory(historian_model, user_message)
-
-    current_session_memory: Union[List, None] = json.loads(temp_mem)
-    new_conversation_entry = {
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "User": user_text + (f"\n\n[Image Analysis Attached]" if image_summary else ""),
-        "Tai": raw_final_response or "No Response"
-    }
-    current_session_memory.append(new_conversation_entry)
-    temp_mem = json.dumps(current_session_memory)
-    end_time_memoryupdate = time.time()
-    print("[UI] Memory updated. (Time: {:.2f} seconds)".format(end_time_memoryupdate - start_time_memoryupdate))
-
-    is_typing = False
-    send_button.enable()  # Re-enable the send button
-    chat_display.set_text(f"{base_text}")
-    chat_display.set_text(
-        chat_display.html_text +
-        f'<font color="red">Tai:</font> {cleaned_response}<br>'
-    )    
-
-    threading.Thread(target=save_memory, args=(temp_mem, glob, IS_ENCRYPTED), daemon=True).start()
-
-    if SPEAKER_MODE:
-        threading.Thread(target=speak, args=(engine, cleaned_response,), daemon=True).start()
-
-def start_ui(model: genai.GenerativeModel) -> None:
-    global user_entry, chat_display, glob, temp_mem
-    start_time = time.time()
-    pygame.init()
-    pygame.display.set_caption('Tai AI Chat')
-    screen_width, screen_height = 800, 600
-    screen = pygame.display.set_mode((screen_width, screen_height))
-    manager = pygame_gui.UIManager((screen_width, screen_height))
-    user_input = pygame_gui.elements.UITextEntryLine(relative_rect=pygame.Rect((20, screen_height - 60), (600, 40)), manager=manager)
-    send_button = pygame_gui.elements.UIButton(relative_rect=pygame.Rect((640, screen_height - 60), (120, 40)), text='Send', manager=manager)
-    upload_button = pygame_gui.elements.UIButton(relative_rect=pygame.Rect((20, screen_height - 110), (120, 40)), text='Upload Image', manager=manager)
-    chat_display = pygame_gui.elements.UITextBox(html_text='', relative_rect=pygame.Rect((20, 20), (760, 500)), manager=manager)
-    clock = pygame.time.Clock()
-    is_running = True
-    end_time = time.time()
-    print(f"[UI] UI started in {end_time - start_time:.2f} seconds.")
-
-    start_time_mem = time.time()
-    try:
-        glob = json.dumps(load_memory("global"))
-        temp_mem = json.dumps(load_memory("restricted"))
-    except Exception as e:
-        print("Error loading memory:", e)
-        glob = json.dumps([])
-        temp_mem = json.dumps([])
-    end_time_mem = time.time()
-    print(f"[UI] Memory loaded in {end_time_mem - start_time_mem:.2f} seconds.")
-
-    print("[UI] Starting event loop...")
-
-    try:
-        while is_running:
-            time_delta = clock.tick(60) / 1000.0
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    print("[UI] Quit event received.")
-                    is_running = False
-                if event.type == pygame.USEREVENT:
-                    if event.user_type == pygame_gui.UI_BUTTON_PRESSED:
-                        if event.ui_element == send_button:
-                            msg = user_input.get_text().strip()
-                            if msg:
-                                threading.Thread(target=send_message, args=(msg, model, manager, chat_display, send_button), daemon=True).start()
-                                user_input.set_text('')
-                        elif event.ui_element == upload_button:
-                            # Open file dialog using Tkinter (hidden root)
-                            root = tk.Tk()
-                            root.withdraw()  # Hide the root window
-                            file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.png;*.jpg;*.jpeg;*.bmp")])
-                            root.destroy()
-                            if file_path:
-                                try:
-                                    # Use Pillow to open the image
-                                    with Image.open(file_path) as img:
-                                        image_format = img.format
-                                        chat_display.append_html_text(f"Image uploaded: {image_format}<br><br>")
-                                        # Process the image (you can add custom logic here)
-                                        with open(file_path, "rb") as img_file:
-                                            image_bytes = img_file.read()
-                                            result = process_image_bytes(seer_model, image_bytes)
-                                            chat_display.append_html_text(f"Image processed:<br>{result}<br><br>")
-                                except Exception as e:
-                                    chat_display.append_html_text(f"Error processing image: {safe_unicode(str(e))}<br><br>")
-                manager.process_events(event)
-
-            manager.update(time_delta)
-            screen.fill((30, 30, 30))
-            manager.draw_ui(screen)
-            pygame.display.update()
-
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-    finally:
-        pygame.quit()
+import google.generativeai as genai
+import threading
+import pyttsx3
+import re
+from datetime import datetime
+from typing import Union, List
+import brain.Blacksmith as Blacksmith
+from brain.Blacksmith import scrape_text_from_url
+import brain.Architect as Architect
+from brain.Architect import generate_code, install_requirements
+import brain.Historian as Historian
+from brain.Historian import save_memory, load_memory, format_memory, format_memory_tail, update_memory, relevant_memory, MemoryCompactor
+from brain.memory_backend import memory_journal
+from brain.memory_store import MemoryStore, MemoryEntry
+import brain.Seer as Seer
+from brain.Seer import process_image_bytes, safe_unicode
+from brain.Bard import speak
+from brain.scheduler import StageScheduler
+from brain.config import MODEL, temp_mem, glob, SPEAKER_MODE, init_documentation, initial_documentation, followup_documentation, IS_ENCRYPTED, is_typing, SPECULATIVE_EVOLUTION, EVOLUTION_MARKER, SEER_WARM_UP
+from buildeasy import Adaptor
+from brain.gitbase_launcher import NotificationManager
+from PIL import Image
+import tkinter as tk
+from tkinter import filedialog
+import time
+import os
+from concurrent.futures import ThreadPoolExecutor, Future
+
+# Initialize notifications and altcolor
+NotificationManager.hide()
+start_time_outer = time.time()
+import pygame
+import pygame_gui
+import altcolor
+altcolor.init(show_credits=False)
+end_time_outer = time.time()
+NotificationManager.show()
+print(f"[UI] AltColor & PyGame initialized. (Time: {end_time_outer - start_time_outer} seconds)")
+
+# Initialize pyttsx3 engine
+engine = pyttsx3.init()
+
+def setup_models():
+    """
+    Initializes all models and starts them in separate threads. This function
+    is blocking and will not return until all models are ready.
+
+    The models are:
+        - Architect: generates code
+        - Historian: manages memory
+        - Blacksmith: generates shell commands
+        - Seer: processes images
+
+    The function prints a message when each model is ready and a final message
+    when all models are ready.
+    """
+    global architect_model, historian_model, blacksmith_model, seer_model
+
+    start_time = time.time()
+    def set_architect():
+        global architect_model
+        architect_model = Architect.set_personality(MODEL)
+        print("[Setup] Architect model ready")
+
+    def set_historian():
+        global historian_model
+        historian_model = Historian.set_personality(MODEL)
+        print("[Setup] Historian model ready")
+
+    def set_blacksmith():
+        global blacksmith_model
+        blacksmith_model = Blacksmith.set_personality(MODEL)
+        print("[Setup] Blacksmith model ready")
+
+    def set_vision():
+        global seer_model
+        seer_model = Seer.set_personality(MODEL)
+        if SEER_WARM_UP:
+            Seer.seer_engine.warm_up()
+        print("[Setup] Seer model ready")
+
+    threads = [
+        threading.Thread(target=set_architect),
+        threading.Thread(target=set_historian),
+        threading.Thread(target=set_blacksmith),
+        threading.Thread(target=set_vision)
+    ]
+
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    end_time = time.time()
+    print("[Setup] All models initialized. (Time: {:.2f} seconds)".format(end_time - start_time))
+
+# The Dictator's system instruction, rendered once by init()
+system_instruction: str = ""
+prefixed_models: dict = {}
+prefixed_models_lock = threading.Lock()
+
+def init(model_name: str) -> genai.GenerativeModel:
+    global system_instruction
+    start_time = time.time()
+    setup_models()
+    system_instruction = init_documentation.render()
+    m = genai.GenerativeModel(
+        model_name,
+        system_instruction=system_instruction
+    )
+    end_time = time.time()
+    print("[UI] Model initialized. (Time: {:.2f} seconds)".format(end_time - start_time))
+    return m
+
+
+def with_static_prefix(model_name: str, prefix: str) -> genai.GenerativeModel:
+    """
+    Returns the Dictator model with a prompt's static prefix appended to its system
+    instruction, so each turn only sends the dynamic rest and the unchanged prefix can
+    be served from the model's cache. A new model is built only when the prefix
+    changes, e.g. after a changelog update.
+    """
+    with prefixed_models_lock:
+        m = prefixed_models.get(prefix)
+        if m is None:
+            prefixed_models.clear()
+            m = prefixed_models[prefix] = genai.GenerativeModel(
+                model_name,
+                system_instruction=f"{system_instruction}\n\n{prefix}"
+            )
+        return m
+
+
+def typing_indicator(chat_display: pygame_gui.elements.UITextBox, send_button: pygame_gui.elements.UIButton):
+    global base_text
+    dots = ["...", "..", ".", ""]
+    index = 0
+    with display_lock:
+        base_text = chat_display.html_text
+    while is_typing:
+        with display_lock:
+            new_text = f"{base_text}\nTai is thinking{dots[index]}"
+            chat_display.set_text(new_text)
+        index = (index + 1) % len(dots)
+        time.sleep(0.5)
+
+
+def summarize_image(image_vision_results: dict) -> str:
+    """Formats Seer's analysis of an uploaded image into a markdown block for the prompt."""
+    return (
+        f"\n### 🖼️ **Image Analysis**\n"
+        f"- **Description**: {image_vision_results.get('description', 'N/A')}\n"
+        f"- **Objects**: {image_vision_results.get('objects', 'N/A')}\n"
+        f"- **OCR Text**: {image_vision_results.get('ocr_text', 'N/A')}\n"
+        f"- **Emotions**: {image_vision_results.get('emotions', 'N/A')}\n"
+        f"- **Suggestions**: {image_vision_results.get('suggestions', 'N/A')}\n"
+    )
+
+
+# === Image Uploads ===
+
+upload_executor = ThreadPoolExecutor(max_workers=2)
+pending_uploads: List["PendingUpload"] = []
+uploads_lock = threading.Lock()
+
+# Status lines from upload workers are posted as events and drawn by the pygame loop
+UPLOAD_STATUS_EVENT = pygame.event.custom_type()
+display_lock = threading.Lock()
+
+def post_status(html: str) -> None:
+    """Queues a status line for the chat display from any thread."""
+    pygame.event.post(pygame.event.Event(UPLOAD_STATUS_EVENT, html=html))
+
+def show_status(chat_display: pygame_gui.elements.UITextBox, html: str) -> None:
+    """
+    Appends a status line to the chat display. During a turn the typing indicator
+    and send_message redraw the display from `base_text`, so the line is added
+    there too instead of being erased.
+    """
+    global base_text
+    with display_lock:
+        if is_typing:
+            base_text += html
+        chat_display.append_html_text(html)
+
+class PendingUpload:
+    """An uploaded image whose analysis runs in the background until the next message picks it up."""
+
+    def __init__(self, name: str, analysis: Future):
+        self.name = name
+        self.analysis = analysis
+
+def upload_image(file_path: str, chat_display: pygame_gui.elements.UITextBox) -> None:
+    """
+    Reads an image and starts analyzing it on a background worker, so the UI never
+    waits on OCR or the vision model. Progress is posted to the pygame loop, which
+    shows it in the chat display, and the finished analysis is attached to the next
+    message that is sent.
+    """
+    name = safe_unicode(os.path.basename(file_path))
+    with Image.open(file_path) as img:  # Only reads the header, to validate the file
+        image_format = img.format
+    with open(file_path, "rb") as img_file:
+        image_bytes = img_file.read()
+    show_status(chat_display, f"Image uploaded: {name} ({image_format}). Analyzing...<br>")
+
+    def progress(status: str):
+        post_status(f"<i>{name}: {status}</i><br>")
+
+    def done(future: Future):
+        if future.exception() is not None:
+            post_status(f"Error processing image: {safe_unicode(str(future.exception()))}<br><br>")
+        else:
+            post_status(f"Image ready: {name}. It will be attached to your next message.<br><br>")
+
+    analysis = upload_executor.submit(process_image_bytes, seer_model, image_bytes, None, progress)
+    analysis.add_done_callback(done)
+    with uploads_lock:
+        pending_uploads.append(PendingUpload(name, analysis))
+
+def take_pending_uploads() -> List[PendingUpload]:
+    """Removes and returns every upload waiting to be attached to a message."""
+    with uploads_lock:
+        uploads = list(pending_uploads)
+        pending_uploads.clear()
+    return uploads
+
+
+def send_message(user_message: Union[str, bytes], model: genai.GenerativeModel, manager: pygame_gui.UIManager, chat_display: pygame_gui.elements.UITextBox, send_button: pygame_gui.elements.UIButton):
+    global SPEAKER_MODE, is_typing, base_text
+    old_text = chat_display.html_text
+
+    user_image = None
+    uploads: List[PendingUpload] = []
+    if isinstance(user_message, dict):
+        user_text = user_message.get("text", "").strip()
+        user_image = user_message.get("image", None)
+        uploads = user_message.get("uploads", [])
+    else:
+        user_text = user_message if isinstance(user_message, str) else ""
+        if isinstance(user_message, bytes):
+            user_image = user_message
+
+    if isinstance(user_message, dict):
+        display_text = user_message.get("text", "").strip()
+        if user_message.get("image"):
+            display_text += "\n[Image Uploaded]"
+        for upload in uploads:
+            display_text += f"\n[Image Attached: {upload.name}]"
+    elif isinstance(user_message, str):
+        display_text = user_message.strip()
+    elif isinstance(user_message, bytes):
+        display_text = "[Image Uploaded]"
+    else:
+        display_text = "[Unrecognized input]"
+
+    chat_display.set_text(
+        chat_display.html_text +
+        f'<font color="blue">You:</font> {display_text}<br>'
+    )
+    
+    # Thread typing loop
+    is_typing = True
+    send_button.disable()  # Disable the send button while typing
+    typing_thread = threading.Thread(target=typing_indicator, args=(chat_display, send_button,))
+    typing_thread.start()
+
+    # Only the recent window and the entries relevant to this message go into the prompts
+    memory_context = ""
+    if glob is not None:
+        memory_context += f"\n##### Global Memory:\n```\n{format_memory(relevant_memory(glob, 'global', user_text), 'global')}\n```\n"
+    if temp_mem is not None:
+        memory_context += f"\n##### Restricted Memory:\n```\n{format_memory_tail(temp_mem, 'restricted', user_text)}\n```\n"
+
+    # === Stages ===
+    # The URL scrape only needs the user message, so it runs alongside the vision +
+    # initial response chain. The evolution pipeline waits for the initial response
+    # and only runs if an upgrade was requested (unless SPECULATIVE_EVOLUTION is set).
+
+    def vision_stage() -> str:
+        summaries = []
+        if user_image:
+            summaries.append(summarize_image(process_image_bytes(seer_model, user_image)))
+        for upload in uploads:
+            try:
+                # Already analyzed (or still analyzing) in the background since the upload
+                summaries.append(summarize_image(upload.analysis.result()))
+            except Exception as e:
+                print(f"[UI] Skipping image {upload.name}: {e}")
+        return "".join(summaries)
+
+    def initial_stage(vision: str) -> genai.types.GenerateContentResponse:
+        static_prefix, initial_prompt = initial_documentation(memory_context, user_text, vision)
+        return with_static_prefix(MODEL, static_prefix).generate_content(initial_prompt)
+
+    def scrape_stage() -> Union[str, None]:
+        return scrape_text_from_url(MODEL, glob, temp_mem, user_message)
+
+    def evolution_stage() -> tuple:
+        return generate_code(
+            blacksmith_model=blacksmith_model,
+            architect_model=architect_model,
+            user_request=user_text,
+            tai=model
+        )
+
+    def lazy_evolution_stage(initial) -> tuple:
+        if EVOLUTION_MARKER not in initial.text:
+            return "N/A", None
+        return evolution_stage()
+
+    def followup_stage(initial, scrape, evolution) -> str:
+        response_text, upgraded_code = evolution
+        if EVOLUTION_MARKER in initial.text:
+            parsed_response_text = initial.text.split(EVOLUTION_MARKER)[1].strip()
+            if upgraded_code:
+                # Only now is the evolution confirmed, so speculative code has had no side effects yet
+                if blacksmith_model is not None:
+                    install_requirements(blacksmith_model, upgraded_code)
+                Adaptor.modify('brain.modifiable', upgraded_code)
+        else:
+            parsed_response_text = initial.text
+            upgraded_code = None
+
+        followup_prompt = f"{followup_documentation(user_text, parsed_response_text, memory_context, upgraded_code, scrape)}"
+        return model.generate_content(followup_prompt).text
+
+    scheduler = StageScheduler(label="UI")
+    scheduler.add_stage("vision", vision_stage)
+    scheduler.add_stage("initial", initial_stage, after=["vision"])
+    scheduler.add_stage("scrape", scrape_stage)
+    if SPECULATIVE_EVOLUTION:
+        scheduler.add_stage("evolution", evolution_stage)
+    else:
+        scheduler.add_stage("evolution", lazy_evolution_stage, after=["initial"])
+    scheduler.add_stage("followup", followup_stage, after=["initial", "scrape", "evolution"])
+    results = scheduler.run()
+    scheduler.report()
+
+    image_summary = results["vision"]
+    raw_final_response = results["followup"]
+
+    cleaned_response = re.sub(r'<[^>]+>.*?</[^>]+>', '', raw_final_response, flags=re.DOTALL)
+    cleaned_response = cleaned_response.replace("```xml", "").replace("```", "").strip()
+
+    if re.search(r'<GlobalMemory>.*?</GlobalMemory>', raw_final_response) or \
+       re.search(r'<Forget>.*?</Forget>', raw_final_response):
+        threading.Thread(target=update_memory, args=(IS_ENCRYPTED, historian_model, user_text, glob), daemon=True).start()
+
+    temp_mem.append(MemoryEntry(
+        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        user=user_text + (f"\n\n[Image Analysis Attached]" if image_summary else ""),
+        tai=raw_final_response or "No Response"
+    ))
+
+    with display_lock:
+        is_typing = False
+        send_button.enable()  # Re-enable the send button
+        chat_display.set_text(f"{base_text}")
+        chat_display.set_text(
+            chat_display.html_text +
+            f'<font color="red">Tai:</font> {cleaned_response}<br>'
+        )
+
+    threading.Thread(target=save_memory, args=(temp_mem, glob, IS_ENCRYPTED), daemon=True).start()
+
+    if SPEAKER_MODE:
+        threading.Thread(target=speak, args=(engine, cleaned_response,), daemon=True).start()
+
+def start_ui(model: genai.GenerativeModel) -> None:
+    global user_entry, chat_display, glob, temp_mem
+    start_time = time.time()
+    pygame.init()
+    pygame.display.set_caption('Tai AI Chat')
+    screen_width, screen_height = 800, 600
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    manager = pygame_gui.UIManager((screen_width, screen_height))
+    user_input = pygame_gui.elements.UITextEntryLine(relative_rect=pygame.Rect((20, screen_height - 60), (600, 40)), manager=manager)
+    send_button = pygame_gui.elements.UIButton(relative_rect=pygame.Rect((640, screen_height - 60), (120, 40)), text='Send', manager=manager)
+    upload_button = pygame_gui.elements.UIButton(relative_rect=pygame.Rect((20, screen_height - 110), (120, 40)), text='Upload Image', manager=manager)
+    chat_display = pygame_gui.elements.UITextBox(html_text='', relative_rect=pygame.Rect((20, 20), (760, 500)), manager=manager)
+    clock = pygame.time.Clock()
+    is_running = True
+    end_time = time.time()
+    print(f"[UI] UI started in {end_time - start_time:.2f} seconds.")
+
+    start_time_mem = time.time()
+    memory_journal.recover()  # Upload memory a previous run saved locally but never flushed
+    try:
+        glob = MemoryStore.from_list("global", load_memory(IS_ENCRYPTED, "global"))
+        temp_mem = MemoryStore.from_list("restricted", load_memory(IS_ENCRYPTED, "restricted"))
+    except Exception as e:
+        print("Error loading memory:", e)
+        glob = MemoryStore("global")
+        temp_mem = MemoryStore("restricted")
+    MemoryCompactor(historian_model, glob, IS_ENCRYPTED).start()
+    end_time_mem = time.time()
+    print(f"[UI] Memory loaded in {end_time_mem - start_time_mem:.2f} seconds.")
+
+    print("[UI] Starting event loop...")
+
+    try:
+        while is_running:
+            time_delta = clock.tick(60) / 1000.0
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    print("[UI] Quit event received.")
+                    is_running = False
+                if event.type == UPLOAD_STATUS_EVENT:
+                    show_status(chat_display, event.html)
+                if event.type == pygame.USEREVENT:
+                    if event.user_type == pygame_gui.UI_BUTTON_PRESSED:
+                        if event.ui_element == send_button:
+                            msg = user_input.get_text().strip()
+                            uploads = take_pending_uploads()
+                            if uploads:
+                                message = {"text": msg, "uploads": uploads}
+                                threading.Thread(target=send_message, args=(message, model, manager, chat_display, send_button), daemon=True).start()
+                                user_input.set_text('')
+                            elif msg:
+                                threading.Thread(target=send_message, args=(msg, model, manager, chat_display, send_button), daemon=True).start()
+                                user_input.set_text('')
+                        elif event.ui_element == upload_button:
+                            # Open file dialog using Tkinter (hidden root)
+                            root = tk.Tk()
+                            root.withdraw()  # Hide the root window
+                            file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.png;*.jpg;*.jpeg;*.bmp")])
+                            root.destroy()
+                            if file_path:
+                                try:
+                                    upload_image(file_path, chat_display)
+                                except Exception as e:
+                                    show_status(chat_display, f"Error processing image: {safe_unicode(str(e))}<br><br>")
+                manager.process_events(event)
+
+            manager.update(time_delta)
+            screen.fill((30, 30, 30))
+            manager.draw_ui(screen)
+            pygame.display.update()
+
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+    finally:
+        pygame.quit()
@@ -1,190 +1,367 @@
-"""Historian Configuration code for Tai AI, a self-evolving AI."""
-
-# === Imports ===
-import json
-from datetime import datetime
-from typing import Optional, Union
-import google.generativeai as genai
-
-from brain.gitbase_launcher import data_system, KeyValue, NotificationManager
-
-# === Model Configuration ===
-
-def set_personality(model_name: str) -> genai.GenerativeModel:
-    """
-    Configures the Historian AI model to adopt the 'Tai' personality.
-
-    Returns a model instance that:
-    - Only generates JSON files according to user instructions.
-    - Returns the exact file with applied edits if a full JSON is provided.
-    - Does not explain or shorten the JSON.
-    - Only returns unchanged input if no edits are requested.
-    - Ensures all keys are double-quoted.
-    """
-    return genai.GenerativeModel(
-        model_name,
-        system_instruction=(
-            "You are 'Tai', an AI model that generates json files according to user preferences. "
-            "Tai does not provide explanations, comments, or any extra content—only code. "
-            "If given a large JSON file with edit instructions, return the exact file with only those edits. "
-            "If no edits are requested, return the file unchanged. "
-            "Ensure all keys in the JSON files use double quotes."
-        )
-    )
-
-# === Content Generation ===
-
-def generate_content(model: genai.GenerativeModel, prompt: str, get_content: Optional[bool] = False) -> Union[str, genai.types.GenerateContentResponse]:
-    """
-    Generates content from the AI model using a prompt.
-
-    - Cleans formatting by removing code block markers.
-    - Ensures the output is valid JSON, starting with a '['.
-    """
-    content = model.generate_content(prompt)
-    text = content.text.strip()
-
-    if text.startswith("```json"):
-        text = text[9:].lstrip()
-    if text.endswith("```"):
-        text = text[:-3].rstrip()
-    if not text.startswith("["):
-        text = "[" + text
-
-    return content if get_content else text
-
-# === Memory Handling ===
-
-def get_current_restricted_memory_file() -> str:
-    """Returns a timestamped filename for restricted session-based memory."""
-    timestamp = datetime.now().strftime("%Y-%m-%d")
-    return f"restricted_memory_{timestamp}"
-
-def load_memory(IS_ENCRYPTED: bool, memory_type: str = "global") -> list:
-    """
-    Loads memory data based on type ('global' or 'restricted').
-
-    Returns a list of memory entries. If no restricted memory is found, creates a template.
-    """
-    memory_file = "global_memory" if memory_type == "global" else get_current_restricted_memory_file()
-    found_restricted = False
-
-    NotificationManager.hide()
-    all_keys = data_system.get_all(encryption=IS_ENCRYPTED, path="taiMem").keys()
-    NotificationManager.show()
-
-    if memory_type == "restricted":
-        found_restricted = any(key == memory_file and key.startswith("restricted_memory_") for key in all_keys)
-
-    try:
-        NotificationManager.hide()
-        if not found_restricted and memory_type == "restricted":
-            template = [
-                {
-                    "timestamp": "2025-03-03 12:16:13",
-                    "Memory": "Template memory, text goes here."
-                }
-            ]
-            data_system.save_data(key=memory_file, value=template, path="taiMem", encryption=IS_ENCRYPTED)
-
-        loaded_memory = data_system.load_data(key=memory_file, path="taiMem", encryption=IS_ENCRYPTED)
-        NotificationManager.show()
-        return json.loads(json.dumps(loaded_memory.value))  # Ensure conversion to Python object
-    except json.JSONDecodeError:
-        NotificationManager.show()
-        return []
-
-def save_memory_backend(temp_mem: str, glob: str, IS_ENCRYPTED: bool, memory_type: str):
-    """
-    Saves memory entries into global or restricted memory.
-
-    Ensures entries are not duplicated based on timestamp.
-    """
-    assert memory_type in ['global', 'restricted'], "Invalid memory type. Use 'global' or 'restricted'."
-    memory_file = "global_memory" if memory_type == 'global' else get_current_restricted_memory_file()
-
-    memory = load_memory(IS_ENCRYPTED, memory_type)
-    if isinstance(memory, str):
-        memory = json.loads(memory)
-    new_entries = json.loads(temp_mem if memory_type == 'restricted' else glob)
-    existing_timestamps = {entry["timestamp"] for entry in memory}
-    unique_new_entries = [entry for entry in new_entries if entry["timestamp"] not in existing_timestamps]
-    memory.extend(unique_new_entries)
-
-    NotificationManager.hide()
-    data_system.save_data(key=memory_file, value=memory, path="taiMem", encryption=IS_ENCRYPTED)
-    NotificationManager.show()
-
-def update_memory(IS_ENCRYPTED: bool, historian_model: genai.GenerativeModel, user_input: str):
-    """
-    Updates the global memory with user input and AI response.
-
-    This function loads the current global memory and generates a prompt to update
-    it based on user input. It uses a memory template and the current timestamp to
-    create a structured prompt for generating the updated memory content. The 
-    updated memory is parsed and stored globally if it is valid JSON.
-
-    Args:
-        user_input (str): The user's input to be integrated into global memory.
-
-    Raises:
-        json.JSONDecodeError: If the generated content cannot be parsed as JSON.
-    """
-    global glob
-    """Add user input and AI response to global memory correctly."""
-    
-    global_memory = load_memory(IS_ENCRYPTED, "global")
-    NotificationManager.hide()
-    mem_template = data_system.load_data(key="memplate", encryption=False, path="memplate").value
-    NotificationManager.show()
-    
-    prompt = f"""# Here is the global memory JSON code: 
-{json.dumps(global_memory, indent=4)}
-# The user requested this:
-{user_input}
-# Here is a memory template:
-{mem_template}
-# Here is the current timestamp:
-{datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-# Return an updated JSON file reflecting any additions/removals as per user request.
-    """
-    
-    new_memory = generate_content(historian_model, prompt)
-    
-    try:
-        new_memory = json.loads(new_memory)  # Ensure valid JSON before saving
-        glob = new_memory  # Store properly formatted JSON
-    except json.JSONDecodeError:
-        pass  # Ignore faulty memory update requests
-
-def save_memory(temp_mem, glob, IS_ENCRYPTED):
-    """
-    Saves both restricted and global memory to the data system in a separate thread
-    to prevent blocking the main thread and causing UI lag. This function is
-    intended to be run in a separate thread to avoid blocking the main thread.
-    """
-    save_memory_backend(temp_mem, glob, IS_ENCRYPTED, 'restricted')
-    save_memory_backend(temp_mem, glob, IS_ENCRYPTED, 'global')
-
-# === Memory Formatting ===
-
-def format_memory(memory: KeyValue, memory_type: str) -> str:
-    """
-    Formats memory data into a readable string format for display.
-
-    Returns formatted past interactions or a placeholder message.
-    """
-    if not memory:
-        return "No past interactions found." if memory_type == "global" else "No previous discussion in this conversation."
-
-    try:
-        if memory_type == "global":
-            return "\n".join(f'{entry["timestamp"]}: {entry.get("Memory", "N/A")}' for entry in memory)
-    except Exception as e:
-        return f"Error formatting memory: {e}"
-
-    print("2")
-    return "\n".join(
-        f'[User: {entry.get("User", "N/A")}\nTai: {entry.get("Tai", "N/A")}\n | Timestamp: {entry["timestamp"]}]'
-        for entry in memory
-    )
+"""Historian Configuration code for Tai AI, a self-evolving AI."""
+
+# === Imports ===
+import json
+import threading
+from datetime import datetime
+from typing import Iterator, Optional, Union
+import google.generativeai as genai
+
+from brain.gitbase_launcher import data_system, NotificationManager
+from brain.memory_backend import memory_journal
+from brain.memory_store import MemoryStore, MemoryEntry, MemoryRenderer, MemoryPatchError, apply_patch, CHARS_PER_TOKEN
+from brain.retrieval import MemoryRetriever
+from brain.config import MEMORY_TOP_K, MEMORY_RECENT_WINDOW, MEMORY_TAIL_MINUTES, MEMORY_TAIL_TOKENS, MEMORY_SUMMARIZE_INTERVAL, MEMORY_SUMMARIZE_BATCH, MEMORY_SUMMARIZE_KEEP
+
+# === Model Configuration ===
+
+def set_personality(model_name: str) -> genai.GenerativeModel:
+    """
+    Configures the Historian AI model to adopt the 'Tai' personality.
+
+    Returns a model instance that:
+    - Only generates JSON according to user instructions.
+    - Returns exactly the JSON shape the prompt asks for, e.g. only the changes to a file.
+    - Does not explain the JSON.
+    - Ensures all keys are double-quoted.
+    """
+    return genai.GenerativeModel(
+        model_name,
+        system_instruction=(
+            "You are 'Tai', an AI model that generates json according to user preferences. "
+            "Tai does not provide explanations, comments, or any extra content—only code. "
+            "Always return exactly the JSON structure the prompt asks for. "
+            "When asked for changes to memory, return only the changes, never the unchanged entries. "
+            "Ensure all keys in the JSON files use double quotes."
+        )
+    )
+
+# === Content Generation ===
+
+def generate_content(model: genai.GenerativeModel, prompt: str, get_content: Optional[bool] = False) -> Union[str, genai.types.GenerateContentResponse]:
+    """
+    Generates content from the AI model using a prompt.
+
+    - Cleans formatting by removing code block markers.
+    - Ensures the output is valid JSON, starting with a '['.
+    """
+    content = model.generate_content(prompt)
+    text = content.text.strip()
+
+    if text.startswith("```json"):
+        text = text[9:].lstrip()
+    if text.endswith("```"):
+        text = text[:-3].rstrip()
+    if not text.startswith("["):
+        text = "[" + text
+
+    return content if get_content else text
+
+# === Memory Handling ===
+
+def get_current_restricted_memory_file() -> str:
+    """Returns a timestamped filename for restricted session-based memory."""
+    timestamp = datetime.now().strftime("%Y-%m-%d")
+    return f"restricted_memory_{timestamp}"
+
+def load_memory(IS_ENCRYPTED: bool, memory_type: str = "global") -> list:
+    """
+    Loads memory data based on type ('global' or 'restricted').
+
+    Returns a list of memory entries. If no restricted memory is found, creates a template.
+    Memory comes from the local journal, which only reaches GitBase the first time a key is read.
+    """
+    memory_file = "global_memory" if memory_type == "global" else get_current_restricted_memory_file()
+    template = None
+    if memory_type == "restricted":
+        template = [
+            {
+                "timestamp": "2025-03-03 12:16:13",
+                "Memory": "Template memory, text goes here."
+            }
+        ]
+
+    try:
+        return memory_journal.load(memory_file, IS_ENCRYPTED, default=template)
+    except json.JSONDecodeError:
+        return []
+
+def stream_memory(IS_ENCRYPTED: bool, memory_type: str = "global") -> Iterator[dict]:
+    """Yields memory entries oldest first without building the whole list."""
+    memory_file = "global_memory" if memory_type == "global" else get_current_restricted_memory_file()
+    return memory_journal.stream(memory_file, IS_ENCRYPTED)
+
+def save_memory_backend(temp_mem: MemoryStore, glob: MemoryStore, IS_ENCRYPTED: bool, memory_type: str):
+    """
+    Saves memory entries into global or restricted memory.
+
+    Only entries added since the last save are written. They go to the local journal,
+    which skips duplicate timestamps and uploads to GitBase in batches.
+    """
+    assert memory_type in ['global', 'restricted'], "Invalid memory type. Use 'global' or 'restricted'."
+    memory_file = "global_memory" if memory_type == 'global' else get_current_restricted_memory_file()
+
+    store = temp_mem if memory_type == 'restricted' else glob
+    new_entries, token = store.pending()
+    if new_entries:
+        memory_journal.append(memory_file, new_entries, IS_ENCRYPTED)
+        store.mark_persisted(token)
+
+def parse_json_reply(text: str) -> Union[dict, list]:
+    """Parses a model reply that should be JSON, ignoring code block markers around it."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+    if text.endswith("```"):
+        text = text[:-3]
+    return json.loads(text.strip())
+
+memory_template = None
+
+def get_memory_template():
+    """Loads the memory template from GitBase once per run."""
+    global memory_template
+    if memory_template is None:
+        NotificationManager.hide()
+        memory_template = data_system.load_data(key="memplate", encryption=False, path="memplate").value
+        NotificationManager.show()
+    return memory_template
+
+def update_memory(IS_ENCRYPTED: bool, historian_model: genai.GenerativeModel, user_input: str, glob: MemoryStore):
+    """
+    Updates the global memory with user input and AI response.
+
+    Only the global memory entries relevant to the request are sent to the Historian
+    model, which answers with an RFC 6902-style patch addressing entries by timestamp.
+    The patch is validated and applied to `glob` locally, then written to the memory
+    journal, so neither the prompt nor the reply grows with the whole memory. A reply
+    that cannot be parsed or validated (e.g. because it was truncated) changes nothing.
+
+    Args:
+        user_input (str): The user's input to be integrated into global memory.
+        glob (MemoryStore): The session's global memory, edited in place.
+    """
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    relevant = relevant_memory(glob, "global", user_input)
+    prompt = f"""# Here are the global memory entries relevant to the request (JSON):
+{json.dumps([entry.to_dict() for entry in relevant], indent=4)}
+# The user requested this:
+{user_input}
+# Here is a memory template:
+{get_memory_template()}
+# Here is the current timestamp:
+{timestamp}
+# Return only the changes the user requested, as a JSON Patch (RFC 6902) list. Entries are addressed by timestamp:
+# - {{"op": "add", "path": "/-", "value": {{"Memory": "..."}}}} adds a memory
+# - {{"op": "remove", "path": "/<timestamp>"}} deletes a memory
+# - {{"op": "replace", "path": "/<timestamp>/Memory", "value": "..."}} rewrites a memory
+# Return [] if nothing changes. Do not repeat unchanged entries.
+    """
+
+    try:
+        patch = parse_json_reply(historian_model.generate_content(prompt).text)
+    except (json.JSONDecodeError, ValueError) as e:
+        print(f"[Historian] Ignoring unreadable memory patch: {e}")  # e.g. a truncated reply
+        return
+    if not patch:
+        return
+
+    # Pure additions can be journaled as a delta; anything else rewrites the key
+    only_additions = isinstance(patch, list) and all(isinstance(op, dict) and op.get("op") == "add" for op in patch)
+
+    def persist(entries: list) -> None:
+        if only_additions:
+            memory_journal.append("global_memory", entries[-len(patch):], IS_ENCRYPTED)
+        else:
+            memory_journal.rewrite("global_memory", entries, IS_ENCRYPTED)
+
+    try:
+        glob.edit(lambda entries: apply_patch(entries, patch, timestamp), persist)
+    except MemoryPatchError as e:
+        print(f"[Historian] Rejected memory patch: {e}")
+
+def save_memory(temp_mem, glob, IS_ENCRYPTED):
+    """
+    Saves both restricted and global memory to the data system in a separate thread
+    to prevent blocking the main thread and causing UI lag. This function is
+    intended to be run in a separate thread to avoid blocking the main thread.
+    """
+    save_memory_backend(temp_mem, glob, IS_ENCRYPTED, 'restricted')
+    save_memory_backend(temp_mem, glob, IS_ENCRYPTED, 'global')
+
+# === Memory Compaction ===
+
+class MemoryCompactor:
+    """
+    Periodically condenses the oldest global memory entries so global memory stops
+    growing without bound.
+
+    Every `interval` seconds, if more than `keep_recent` + `batch_size` entries exist,
+    the oldest `batch_size` entries that were not condensed before are sent to the
+    Historian model, which returns a handful of durable facts. Those replace the batch
+    in place (reusing the batch's latest timestamps, so order is kept) and are marked
+    `"condensed": true`. The newest `keep_recent` entries are never condensed.
+    """
+
+    def __init__(self, historian_model: genai.GenerativeModel, glob: MemoryStore, IS_ENCRYPTED: bool, interval: float = MEMORY_SUMMARIZE_INTERVAL, batch_size: int = MEMORY_SUMMARIZE_BATCH, keep_recent: int = MEMORY_SUMMARIZE_KEEP):
+        self.historian_model = historian_model
+        self.glob = glob
+        self.IS_ENCRYPTED = IS_ENCRYPTED
+        self.interval = interval
+        self.batch_size = batch_size
+        self.keep_recent = keep_recent
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def next_batch(self) -> list:
+        """Returns the oldest run of entries that has not been condensed yet, if it is long enough."""
+        entries = self.glob[:max(len(self.glob) - self.keep_recent, 0)]
+        start = 0
+        while start < len(entries) and entries[start].get("condensed"):
+            start += 1
+        batch = []
+        for entry in entries[start:start + self.batch_size]:
+            if entry.get("condensed"):
+                break
+            batch.append(entry)
+        return batch if len(batch) == self.batch_size else []
+
+    def run_once(self) -> bool:
+        """Condenses one batch. Returns True if memory was changed."""
+        batch = self.next_batch()
+        if not batch:
+            return False
+
+        limit = max(1, len(batch) // 4)
+        prompt = f"""# Here are old global memory entries (JSON):
+{json.dumps([entry.to_dict() for entry in batch], indent=4)}
+# Condense them into at most {limit} short memories that keep every durable fact, preference and
+# instruction about the user, and drop small talk and anything already superseded.
+# Return a JSON list of strings, oldest first.
+        """
+        try:
+            facts = parse_json_reply(self.historian_model.generate_content(prompt).text)
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"[Historian] Memory compaction skipped: {e}")
+            return False
+        facts = [fact.strip() for fact in facts if isinstance(fact, str) and fact.strip()] if isinstance(facts, list) else []
+        if not facts or len(facts) > len(batch) // 2:
+            return False
+
+        timestamps = [entry.timestamp for entry in batch[-len(facts):]]
+        condensed = [MemoryEntry(ts, memory=fact, extra={"condensed": True}) for ts, fact in zip(timestamps, facts)]
+        batch_timestamps = [entry.timestamp for entry in batch]
+
+        def apply(entries: list) -> list:
+            for i in range(len(entries) - len(batch) + 1):
+                if [entry.timestamp for entry in entries[i:i + len(batch)]] == batch_timestamps:
+                    return entries[:i] + condensed + entries[i + len(batch):]
+            return entries  # The batch was edited meanwhile; leave memory as it is
+
+        self.glob.edit(apply, lambda entries: memory_journal.rewrite("global_memory", entries, self.IS_ENCRYPTED))
+        print(f"[Historian] Condensed {len(batch)} old memories into {len(facts)}.")
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                while self.run_once() and not self._stop.is_set():
+                    pass
+            except Exception as e:
+                print(f"[Historian] Memory compaction failed: {e}")
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="MemoryCompactor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+# === Memory Retrieval ===
+
+memory_retrievers = {"global": MemoryRetriever(), "restricted": MemoryRetriever()}
+
+def relevant_memory(memory: MemoryStore, memory_type: str, query: str, top_k: int = MEMORY_TOP_K, recent: int = MEMORY_RECENT_WINDOW) -> list:
+    """
+    Returns the entries of `memory` worth putting into a prompt about `query`:
+    the most recent ones plus the best BM25 matches among the rest, in order.
+    """
+    return memory_retrievers[memory_type].select(memory, query, top_k, recent)
+
+# === Memory Formatting ===
+
+def format_global_entry(entry: MemoryEntry) -> str:
+    return f'{entry["timestamp"]}: {entry.get("Memory", "N/A")}'
+
+def format_restricted_entry(entry: MemoryEntry) -> str:
+    return f'[User: {entry.get("User", "N/A")}\nTai: {entry.get("Tai", "N/A")}\n | Timestamp: {entry["timestamp"]}]'
+
+SUMMARY_MARGIN = 16  # room for the summary's counts growing when the tail is shortened
+
+def memory_tail_summary(older: list, recalled: int) -> str:
+    """Describes the entries left out of a memory tail and how many of them are recalled below it."""
+    span = f"{len(older)} earlier entries from {older[0].timestamp} to {older[-1].timestamp}"
+    if recalled == len(older):
+        return f"[Summary: the {span} follow, then the most recent entries.]"
+    if recalled:
+        return f"[Summary: {span} are not shown in full; the {recalled} most relevant to this message follow, then the most recent entries.]"
+    return f"[Summary: {span} are not shown; the most recent entries follow.]"
+
+memory_renderers = {"global": MemoryRenderer(format_global_entry), "restricted": MemoryRenderer(format_restricted_entry)}
+
+def format_memory(memory: Union[MemoryStore, list], memory_type: str) -> str:
+    """
+    Formats memory data into a readable string format for display.
+
+    Returns formatted past interactions or a placeholder message. A whole MemoryStore
+    reuses its cached rendering, so only entries added since the last call are formatted.
+    """
+    if not memory:
+        return "No past interactions found." if memory_type == "global" else "No previous discussion in this conversation."
+
+    renderer = memory_renderers[memory_type]
+    try:
+        if isinstance(memory, MemoryStore):
+            return renderer.render(memory)
+        return renderer.separator.join(renderer.format_entry(entry) for entry in memory)
+    except Exception as e:
+        return f"Error formatting memory: {e}"
+
+def format_memory_tail(memory: MemoryStore, memory_type: str, query: str, minutes: float = MEMORY_TAIL_MINUTES, token_budget: int = MEMORY_TAIL_TOKENS) -> str:
+    """
+    Formats the last `minutes` minutes of memory, within roughly `token_budget` tokens.
+
+    Older entries are replaced by a one-line summary, followed by the few of them
+    most relevant to `query`, so the prompt keeps recent context first without
+    growing with the length of the session. The recalled entries get at most half of
+    the budget and the recent tail is shortened to make room for them; only a single
+    newest entry larger than the budget can exceed it.
+    """
+    if not memory:
+        return format_memory(memory, memory_type)
+
+    renderer = memory_renderers[memory_type]
+    try:
+        tail, start = renderer.render_tail(memory, minutes, token_budget)
+        if start == 0:
+            return tail
+
+        budget = token_budget * CHARS_PER_TOKEN
+        recalled, used = [], 0
+        # Keep the most recent of the recalled entries that fit in half of the budget
+        for entry in reversed(memory_retrievers[memory_type].select(memory[:start], query, MEMORY_TOP_K, 0, memory)):
+            line = renderer.format_entry(entry)
+            if used + len(line) + len(renderer.separator) > budget // 2:
+                break
+            recalled.insert(0, line)
+            used += len(line) + len(renderer.separator)
+
+        summary = memory_tail_summary(memory[:start], len(recalled))
+        reserved = used + len(summary) + len(renderer.separator) + SUMMARY_MARGIN
+        tail, start = renderer.render_tail(memory, minutes, max(budget - reserved, 0) // CHARS_PER_TOKEN)
+        # Shortening the tail only moves more entries into the summarized part
+        summary = memory_tail_summary(memory[:start], len(recalled))
+        return renderer.separator.join([summary] + recalled + [tail])
+    except Exception as e:
+        return f"Error formatting memory: {e}"
@@ -1,88 +1,449 @@
-import google.generativeai as genai
-from typing import Optional, Union, List
-import os
-import io
-import base64
-from PIL import Image
-import numpy as np
-import cv2
-import easyocr  # EasyOCR replaces Tesseract here
-import unicodedata
-
-def set_personality(model_name: str) -> genai.GenerativeModel:
-    """
-    Configures the Seer AI model to interpret and act on requests
-    related to Python library management. Returns a model instance
-    that operates as 'Tai', with the sole purpose of generating shell
-    commands or Python code to install or manage libraries.
-    """
-    return genai.GenerativeModel(
-        model_name,
-        system_instruction=(f"""
-You are 'Tai', an AI configuration focused on highly capable at image understanding. Perform OCR, object detection, 
-scene description, facial analysis, image classification, and multimodal reasoning. Return structured JSON 
-with keys: description, objects, ocr_text, emotions, suggestions.
-Do not include explanations or comments. Only output the required json.
-If given a large JSON file with edit instructions, return the exact file with only those edits. 
-If no edits are requested, return the file unchanged. 
-Ensure all keys in the JSON files use double quotes.
-        """)
-    )
-
-def generate_content(model: genai.GenerativeModel, prompt: str, get_content: Optional[bool] = False) -> Union[str, genai.types.GenerateContentResponse]:
-    """
-    Generates content from the AI model using a prompt.
-
-    - Cleans formatting by removing code block markers.
-    - Ensures the output is valid JSON, starting with a '['.
-    """
-    content = model.generate_content(prompt)
-    text = content.text.strip()
-
-    if text.startswith("```json"):
-        text = text[9:].lstrip()
-    if text.endswith("```"):
-        text = text[:-3].rstrip()
-    if not text.startswith("["):
-        text = "[" + text
-
-    return content if get_content else text
-
-def process_image_bytes(seer_model: genai.GenerativeModel, image_bytes: bytes) -> dict:
-    """
-    Perform multi-stage image analysis: OCR, object detection, scene description, emotion analysis.
-
-    Returns structured JSON.
-    """
-    # Decode image
-    image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
-    np_img = np.array(image)
-
-    # OCR using EasyOCR
-    reader = easyocr.Reader(['en'])  # You can specify other languages here
-    ocr_results = reader.readtext(np_img)
-    ocr_text = " ".join([result[1] for result in ocr_results])  # Join all the detected text
-
-    # Basic object detection via OpenCV Haar cascades (face detection)
-    gray = cv2.cvtColor(np_img, cv2.COLOR_BGR2GRAY)
-    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-    faces = face_cascade.detectMultiScale(gray, 1.1, 4).tolist()
-
-    # Generate vision-model structured analysis
-    encoded = base64.b64encode(image_bytes).decode('utf-8')
-    prompt = {
-        'image_base64': encoded,
-        'features': ['description', 'objects', 'emotions', 'suggestions']
-    }
-    response = seer_model.generate_content(prompt)
-    vision_data = response.json()
-
-    # Merge low-level and high-level
-    vision_data['ocr_text'] = ocr_text.strip()
-    vision_data['faces_detected'] = faces
-    print(vision_data)
-    return vision_data
-
-
-def safe_unicode(text):
+import google.generativeai as genai
+from typing import Optional, Union, List, Callable
+import os
+import io
+import base64
+from PIL import Image, ImageOps
+import numpy as np
+import cv2
+import easyocr  # EasyOCR replaces Tesseract here
+import unicodedata
+import threading
+import time
+import copy
+import json
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
+
+from brain.config import SEER_LANGUAGES, SEER_MAX_IN_FLIGHT, SEER_OCR_TIMEOUT, SEER_FACES_TIMEOUT, SEER_VISION_TIMEOUT, SEER_MAX_DIMENSION, SEER_UPLOAD_FORMAT, SEER_UPLOAD_QUALITY, SEER_SMALL_TEXT_PX, SEER_CACHE_SIZE, SEER_DISK_CACHE, SEER_CACHE_DIR
+
+def set_personality(model_name: str) -> genai.GenerativeModel:
+    """
+    Configures the Seer AI model to interpret and act on requests
+    related to Python library management. Returns a model instance
+    that operates as 'Tai', with the sole purpose of generating shell
+    commands or Python code to install or manage libraries.
+    """
+    return genai.GenerativeModel(
+        model_name,
+        system_instruction=(f"""
+You are 'Tai', an AI configuration focused on highly capable at image understanding. Perform OCR, object detection, 
+scene description, facial analysis, image classification, and multimodal reasoning. Return structured JSON 
+with keys: description, objects, ocr_text, emotions, suggestions.
+Do not include explanations or comments. Only output the required json.
+If given a large JSON file with edit instructions, return the exact file with only those edits. 
+If no edits are requested, return the file unchanged. 
+Ensure all keys in the JSON files use double quotes.
+        """)
+    )
+
+def generate_content(model: genai.GenerativeModel, prompt: str, get_content: Optional[bool] = False) -> Union[str, genai.types.GenerateContentResponse]:
+    """
+    Generates content from the AI model using a prompt.
+
+    - Cleans formatting by removing code block markers.
+    - Ensures the output is valid JSON, starting with a '['.
+    """
+    content = model.generate_content(prompt)
+    text = content.text.strip()
+
+    if text.startswith("```json"):
+        text = text[9:].lstrip()
+    if text.endswith("```"):
+        text = text[:-3].rstrip()
+    if not text.startswith("["):
+        text = "[" + text
+
+    return content if get_content else text
+
+class PreparedImage:
+    """An uploaded image after preprocessing, shared by every Seer stage."""
+
+    __slots__ = ("gray", "source_bytes", "scale", "upload_bytes")
+
+    def __init__(self, gray: np.ndarray, source_bytes: Optional[bytes], scale: float, upload_bytes: bytes):
+        self.gray = gray  # downscaled grayscale, used by OCR and face detection
+        self.source_bytes = source_bytes  # the uploaded bytes, only kept if the image was downscaled
+        self.scale = scale  # downscaled size / original size
+        self.upload_bytes = upload_bytes  # re-encoded payload for the vision model
+
+    def original_gray(self) -> np.ndarray:
+        """Decodes the full-resolution grayscale image. Only needed to re-read small text, so it is never kept."""
+        return np.array(ImageOps.exif_transpose(Image.open(io.BytesIO(self.source_bytes))).convert('L'))
+
+    def to_original(self, boxes: list) -> list:
+        """Maps [x, y, w, h] boxes found in `gray` back to the original image's pixels."""
+        return [[round(value / self.scale) for value in box] for box in boxes]
+
+def prepare_image(image_bytes: bytes, max_dimension: int = SEER_MAX_DIMENSION, upload_format: str = SEER_UPLOAD_FORMAT, quality: int = SEER_UPLOAD_QUALITY) -> PreparedImage:
+    """
+    Decodes and preprocesses an image once for every Seer stage.
+
+    - Applies the EXIF orientation and downscales so the longest side is at most `max_dimension`.
+    - Builds one grayscale copy shared by OCR and face detection. The full-resolution
+      image is not kept; OCR decodes it again from the original bytes if it has to
+      re-read small text.
+    - Re-encodes the downscaled image as JPEG/WebP for the vision upload, keeping the
+      original bytes if they are already smaller.
+    """
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(image_bytes))).convert('RGB')
+    width, height = image.size
+    scale = min(1.0, max_dimension / max(width, height))
+
+    if scale < 1.0:
+        image = image.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.LANCZOS)
+    gray = np.array(image.convert('L'))
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=upload_format, quality=quality)
+    upload_bytes = buffer.getvalue()
+    if scale == 1.0 and len(upload_bytes) >= len(image_bytes):
+        upload_bytes = image_bytes
+
+    return PreparedImage(gray, image_bytes if scale < 1.0 else None, scale, upload_bytes)
+
+def median_text_height(ocr_results: list) -> float:
+    """Returns the median height in pixels of EasyOCR's detected text boxes."""
+    heights = sorted(max(point[1] for point in box) - min(point[1] for point in box) for box, _, _ in ocr_results)
+    return heights[len(heights) // 2] if heights else 0.0
+
+
+class SeerEngine:
+    """
+    Holds the local computer-vision models used by Seer.
+
+    The EasyOCR reader and the Haar face cascade are expensive to build, so they are
+    loaded once, on first use (or by `warm_up()`), and shared by every image. Loading
+    and inference are guarded by locks, so one engine can be used from any thread.
+    """
+
+    def __init__(self, languages: Optional[List[str]] = None, gpu: bool = True):
+        self.languages = list(languages or ["en"])
+        self.gpu = gpu
+        self._reader: Optional[easyocr.Reader] = None
+        self._face_cascade: Optional[cv2.CascadeClassifier] = None
+        self._reader_lock = threading.Lock()
+        self._cascade_lock = threading.Lock()
+        self._reader_ready = threading.Event()
+
+    @property
+    def reader(self) -> easyocr.Reader:
+        if self._reader is None:
+            with self._reader_lock:
+                if self._reader is None:
+                    start_time = time.time()
+                    self._reader = easyocr.Reader(self.languages, gpu=self.gpu)
+                    print("[Seer] OCR reader loaded. (Time: {:.2f} seconds)".format(time.time() - start_time))
+                    self._reader_ready.set()
+        return self._reader
+
+    def reader_loaded(self, timeout: Optional[float] = None) -> bool:
+        """Waits up to `timeout` seconds for the OCR reader to be loaded and returns whether it is."""
+        return self._reader_ready.wait(timeout)
+
+    @property
+    def face_cascade(self) -> cv2.CascadeClassifier:
+        if self._face_cascade is None:
+            with self._cascade_lock:
+                if self._face_cascade is None:
+                    self._face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        return self._face_cascade
+
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """Loads both models now. With `background`, loads them on a daemon thread and returns it."""
+        def load():
+            self.reader
+            self.face_cascade
+
+        if not background:
+            load()
+            return None
+        thread = threading.Thread(target=load, daemon=True)
+        thread.start()
+        return thread
+
+    def _read(self, reader: easyocr.Reader, image: PreparedImage) -> str:
+        ocr_results = reader.readtext(image.gray)
+        # Small text doesn't survive downscaling well; re-read it from the original
+        if image.source_bytes is not None and ocr_results and median_text_height(ocr_results) < SEER_SMALL_TEXT_PX:
+            ocr_results = reader.readtext(image.original_gray())
+        return " ".join([result[1] for result in ocr_results]).strip()  # Join all the detected text
+
+    def read_text(self, image: PreparedImage) -> str:
+        """Runs OCR on a prepared image and returns all detected text joined by spaces."""
+        reader = self.reader
+        with self._reader_lock:
+            return self._read(reader, image)
+
+    def read_texts(self, images: List[PreparedImage]) -> List[str]:
+        """Runs OCR over a batch of prepared images, holding the reader for the whole batch."""
+        reader = self.reader
+        with self._reader_lock:
+            return [self._read(reader, image) for image in images]
+
+    def detect_faces(self, gray: np.ndarray) -> list:
+        """Runs the Haar cascade on a grayscale image and returns face boxes as [x, y, w, h] lists."""
+        face_cascade = self.face_cascade
+        with self._cascade_lock:
+            faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+        return faces.tolist() if len(faces) else []
+
+
+seer_engine = SeerEngine(SEER_LANGUAGES)
+
+class AnalysisCache:
+    """
+    Caches merged image analysis results by the SHA-256 of the image bytes.
+
+    Results live in an in-memory LRU of `max_entries`, and optionally as JSON files in
+    `disk_dir` so re-uploads are recognized across restarts. Results that recorded an
+    error are never cached.
+    """
+
+    def __init__(self, max_entries: int = 128, disk_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(image_bytes: bytes) -> str:
+        return hashlib.sha256(image_bytes).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return json.loads(self._entries[key])
+
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), "r", encoding="utf-8") as file:
+                    serialized = file.read()
+                result = json.loads(serialized)
+            except (OSError, ValueError):
+                return None
+            self._remember(key, serialized)
+            return result
+        return None
+
+    def put(self, key: str, result: dict) -> None:
+        if 'error' in result:
+            return
+        try:
+            serialized = json.dumps(result)
+        except (TypeError, ValueError):
+            return
+        self._remember(key, serialized)
+
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                tmp_path = f"{self._disk_path(key)}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as file:
+                    file.write(serialized)
+                os.replace(tmp_path, self._disk_path(key))
+            except OSError as e:
+                print(f"[Seer] Could not write analysis cache: {e}")
+
+    def _remember(self, key: str, serialized: str) -> None:
+        # Stored serialized so callers can't mutate cached results
+        with self._lock:
+            self._entries[key] = serialized
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+analysis_cache = AnalysisCache(SEER_CACHE_SIZE, SEER_CACHE_DIR if SEER_DISK_CACHE else None)
+
+def request_vision(seer_model: genai.GenerativeModel, image_bytes: bytes) -> dict:
+    """Asks the vision model for the high-level analysis (description, objects, emotions, suggestions)."""
+    encoded = base64.b64encode(image_bytes).decode('utf-8')
+    prompt = {
+        'image_base64': encoded,
+        'features': ['description', 'objects', 'emotions', 'suggestions']
+    }
+    response = seer_model.generate_content(prompt)
+    return response.json()
+
+def stage_result(future: Future, name: str, deadline: float, errors: List[str]):
+    """Waits for a stage until `deadline` (a time.time() value). Records failures in `errors` and returns None."""
+    try:
+        return future.result(timeout=max(0, deadline - time.time()))
+    except FutureTimeoutError:
+        errors.append(f"{name}: timed out")
+    except Exception as e:
+        errors.append(f"{name}: {e}")
+    return None
+
+def analyze_image(seer_model: genai.GenerativeModel, image_bytes: bytes, engine: Optional[SeerEngine] = None, progress: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    Perform multi-stage image analysis: OCR, object detection, scene description, emotion analysis.
+    Always runs the full pipeline; see `process_image_bytes` for the cached entry point.
+
+    The vision model request and the local OCR and face detection run concurrently
+    and are merged at the end. Each stage has its own time limit (SEER_*_TIMEOUT); a
+    stage that fails or runs over is left out and noted under 'error', so a slow OCR
+    never holds back the description.
+
+    Uses the shared `seer_engine` unless another engine is given. If `progress` is
+    given, it is called with a short status message as each stage finishes.
+
+    Returns structured JSON.
+    """
+    engine = engine or seer_engine
+    report = progress or (lambda status: None)
+    start_time = time.time()
+    errors: List[str] = []
+
+    # Decode, downscale and re-encode once for every stage
+    image = prepare_image(image_bytes)
+    report("image prepared")
+
+    executor = ThreadPoolExecutor(max_workers=3)
+    try:
+        # Generate vision-model structured analysis
+        vision_future = executor.submit(request_vision, seer_model, image.upload_bytes)
+
+        # OCR using EasyOCR and face detection via OpenCV Haar cascades
+        ocr_future = executor.submit(engine.read_text, image)
+        faces_future = executor.submit(engine.detect_faces, image.gray)
+
+        for name, future in (("text recognition", ocr_future), ("face detection", faces_future), ("scene description", vision_future)):
+            future.add_done_callback(lambda f, name=name: report(f"{name} finished"))
+
+        # The OCR limit starts once the reader is loaded: the first load alone can take longer than it
+        while not engine.reader_loaded(0.1) and not ocr_future.done():
+            pass
+        ocr_text = stage_result(ocr_future, "ocr", time.time() + SEER_OCR_TIMEOUT, errors)
+        faces = stage_result(faces_future, "faces", start_time + SEER_FACES_TIMEOUT, errors)
+        vision_data = stage_result(vision_future, "vision", start_time + SEER_VISION_TIMEOUT, errors)
+    finally:
+        executor.shutdown(wait=False)  # don't wait on stages that ran over
+
+    # Merge low-level and high-level
+    vision_data = vision_data if isinstance(vision_data, dict) else {}
+    vision_data['ocr_text'] = ocr_text if ocr_text is not None else ""
+    vision_data['faces_detected'] = image.to_original(faces) if faces is not None else []
+    if errors:
+        vision_data['error'] = "; ".join(errors)
+    print(vision_data)
+    return vision_data
+
+def analyze_images(seer_model: genai.GenerativeModel, batch: List[bytes], engine: Optional[SeerEngine] = None, max_in_flight: int = SEER_MAX_IN_FLIGHT) -> List[dict]:
+    """
+    Analyzes a batch of images. Always runs the full pipeline; see `process_images`
+    for the cached entry point.
+
+    Images are prepared (decoded, downscaled, re-encoded) in a thread pool, and each
+    image's vision model request starts as soon as it is ready, with at most
+    `max_in_flight` running at once. Meanwhile OCR and face detection run over the
+    whole batch.
+
+    Returns one dict per image, in input order, with the same keys as
+    `analyze_image`. If any stage fails for an image, its dict holds the
+    stages that succeeded plus an 'error' message; other images are unaffected.
+    """
+    engine = engine or seer_engine
+    start_time = time.time()
+    results: List[dict] = [{} for _ in batch]
+    errors: List[List[str]] = [[] for _ in batch]
+
+    with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as vision_pool, ThreadPoolExecutor() as decode_pool:
+        prepare_futures = [decode_pool.submit(prepare_image, image_bytes) for image_bytes in batch]
+        # Each vision request starts as soon as its own image is prepared
+        vision_futures = [vision_pool.submit(lambda f=future: request_vision(seer_model, f.result().upload_bytes)) for future in prepare_futures]
+
+        prepared = {}
+        for index, future in enumerate(prepare_futures):
+            try:
+                prepared[index] = future.result()
+            except Exception as e:
+                errors[index].append(f"decode: {e}")
+
+        indices = list(prepared)
+        try:
+            ocr_texts = engine.read_texts([prepared[index] for index in indices])
+        except Exception:
+            # Retry one by one so a single bad image doesn't lose the batch's OCR
+            ocr_texts = []
+            for index in indices:
+                try:
+                    ocr_texts.append(engine.read_text(prepared[index]))
+                except Exception as e:
+                    ocr_texts.append(None)
+                    errors[index].append(f"ocr: {e}")
+
+        for index, ocr_text in zip(indices, ocr_texts):
+            if ocr_text is not None:
+                results[index]['ocr_text'] = ocr_text
+            try:
+                results[index]['faces_detected'] = prepared[index].to_original(engine.detect_faces(prepared[index].gray))
+            except Exception as e:
+                errors[index].append(f"faces: {e}")
+
+        for index, future in enumerate(vision_futures):
+            if index not in prepared:
+                continue
+            try:
+                vision_data = future.result()
+                results[index] = {**vision_data, **results[index]}
+            except Exception as e:
+                errors[index].append(f"vision: {e}")
+
+    for index, messages in enumerate(errors):
+        if messages:
+            results[index]['error'] = "; ".join(messages)
+
+    print("[Seer] Processed {} image(s). (Time: {:.2f} seconds)".format(len(batch), time.time() - start_time))
+    return results
+
+
+def process_image_bytes(seer_model: genai.GenerativeModel, image_bytes: bytes, engine: Optional[SeerEngine] = None, progress: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    Returns the analysis of an image, running `analyze_image` only if the same
+    image bytes have not been analyzed before.
+    """
+    key = AnalysisCache.key(image_bytes)
+    cached = analysis_cache.get(key)
+    if cached is not None:
+        print("[Seer] Image analysis served from cache.")
+        if progress:
+            progress("analysis found in cache")
+        return cached
+
+    result = analyze_image(seer_model, image_bytes, engine, progress)
+    analysis_cache.put(key, result)
+    return result
+
+def process_images(seer_model: genai.GenerativeModel, batch: List[bytes], engine: Optional[SeerEngine] = None, max_in_flight: int = SEER_MAX_IN_FLIGHT) -> List[dict]:
+    """
+    Returns the analysis of each image in `batch`, in input order. Cached images are
+    served from the analysis cache, and the rest (each distinct image once) go
+    through `analyze_images`.
+    """
+    keys = [AnalysisCache.key(image_bytes) for image_bytes in batch]
+    results: List[Optional[dict]] = [analysis_cache.get(key) for key in keys]
+
+    missing = {}
+    for index, key in enumerate(keys):
+        if results[index] is None and key not in missing:
+            missing[key] = batch[index]
+
+    if missing:
+        analyzed = dict(zip(missing, analyze_images(seer_model, list(missing.values()), engine, max_in_flight)))
+        for key, result in analyzed.items():
+            analysis_cache.put(key, result)
+        for index, key in enumerate(keys):
+            if results[index] is None:
+                results[index] = copy.deepcopy(analyzed[key])
+    return results
+
+
+def safe_unicode(text):
     return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
\ No newline at end of file
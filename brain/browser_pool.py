@@ -0,0 +1,196 @@
+"""Headless browser pool for Tai AI, a self-evolving AI."""
+import asyncio
+import atexit
+import threading
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Error as PlaywrightError
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/113.0.0.0 Safari/537.36"
+)
+
+
+class BrowserPool:
+    """
+    A long-lived headless Chromium shared by every scrape.
+
+    Playwright objects are bound to the event loop that created them, so the pool
+    owns a private asyncio loop on a daemon thread and every borrower's work is
+    run there. Callers on any thread use `run()`, which blocks until done.
+
+    - Chromium is launched lazily on first use and reused afterwards.
+    - At most `max_pages` pages are open at once; extra borrowers wait their turn.
+    - Released pages are kept for reuse. Pages idle for longer than `idle_timeout`
+      seconds are closed, and the browser itself is closed once nothing is open.
+    - If Chromium crashes or disconnects, it is relaunched on the next borrow and
+      the failed borrow is retried once on a fresh page.
+    """
+
+    def __init__(self, max_pages: int = 4, idle_timeout: float = 300, headless: bool = True, user_agent: str = DEFAULT_USER_AGENT):
+        self.max_pages = max_pages
+        self.idle_timeout = idle_timeout
+        self.headless = headless
+        self.user_agent = user_agent
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # Only touched from the pool's loop
+        self._playwright = None
+        self._browser: Optional[Browser] = None
+        self._context: Optional[BrowserContext] = None
+        self._idle_pages: List[Tuple[Page, float]] = []
+        self._pages_in_use: int = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+
+    # === Loop Management ===
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run_loop():
+                    asyncio.set_event_loop(self._loop)
+                    self._semaphore = asyncio.Semaphore(self.max_pages)
+                    self._launch_lock = asyncio.Lock()
+                    self._loop.create_task(self._evict_idle())
+                    ready.set()
+                    self._loop.run_forever()
+
+                self._thread = threading.Thread(target=run_loop, name="BrowserPool", daemon=True)
+                self._thread.start()
+                ready.wait()
+        return self._loop
+
+    # === Browser Lifecycle ===
+
+    async def _ensure_browser(self) -> BrowserContext:
+        async with self._launch_lock:
+            if self._browser is not None and not self._browser.is_connected():
+                print("[BrowserPool] Browser disconnected, relaunching.")
+                await self._reset()
+            if self._browser is None:
+                start_time = time.time()
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                self._context = await self._browser.new_context(user_agent=self.user_agent)
+                print("[BrowserPool] Browser launched. (Time: {:.2f} seconds)".format(time.time() - start_time))
+            return self._context
+
+    async def _reset(self) -> None:
+        """Drops the browser and every pooled page, ignoring errors from a dead browser."""
+        self._idle_pages.clear()
+        browser, self._browser, self._context = self._browser, None, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except PlaywrightError:
+                pass
+
+    async def _acquire_page(self) -> Page:
+        context = await self._ensure_browser()
+        while self._idle_pages:
+            page, _ = self._idle_pages.pop()
+            if not page.is_closed():
+                return page
+        return await context.new_page()
+
+    async def _release_page(self, page: Page, healthy: bool) -> None:
+        if healthy and not page.is_closed() and self._browser is not None and self._browser.is_connected():
+            try:
+                await page.goto("about:blank")
+                self._idle_pages.append((page, time.time()))
+                return
+            except PlaywrightError:
+                pass
+        try:
+            await page.close()
+        except PlaywrightError:
+            pass
+
+    async def _evict_idle(self) -> None:
+        while True:
+            await asyncio.sleep(min(30, self.idle_timeout))
+            now = time.time()
+            keep = []
+            for page, released_at in self._idle_pages:
+                if now - released_at > self.idle_timeout:
+                    try:
+                        await page.close()
+                    except PlaywrightError:
+                        pass
+                else:
+                    keep.append((page, released_at))
+            self._idle_pages = keep
+            if self._browser is not None and not self._idle_pages and self._pages_in_use == 0:
+                async with self._launch_lock:
+                    if not self._idle_pages and self._pages_in_use == 0:
+                        await self._reset()
+                        print("[BrowserPool] Idle browser closed.")
+
+    # === Borrowing ===
+
+    async def _borrow(self, func: Callable[[Page], Awaitable[Any]]) -> Any:
+        async with self._semaphore:
+            self._pages_in_use += 1
+            try:
+                for attempt in range(2):
+                    page = await self._acquire_page()
+                    healthy = False
+                    try:
+                        result = await func(page)
+                        healthy = True
+                        return result
+                    except PlaywrightError:
+                        crashed = page.is_closed() or self._browser is None or not self._browser.is_connected()
+                        if attempt == 0 and crashed:
+                            continue
+                        healthy = not crashed
+                        raise
+                    finally:
+                        await self._release_page(page, healthy)
+            finally:
+                self._pages_in_use -= 1
+
+    def run(self, func: Callable[[Page], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """
+        Borrows a page, awaits `func(page)` on the pool's loop and returns its result.
+        Safe to call from any thread except the pool's own.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._borrow(func), self._ensure_loop())
+        return future.result(timeout)
+
+    def submit(self, func: Callable[[Page], Awaitable[Any]]):
+        """Like `run()`, but returns a concurrent.futures.Future instead of blocking."""
+        return asyncio.run_coroutine_threadsafe(self._borrow(func), self._ensure_loop())
+
+    def close(self, timeout: float = 10) -> None:
+        """Closes the browser and stops the pool's loop."""
+        if self._loop is None:
+            return
+
+        async def shutdown():
+            await self._reset()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout)
+        except Exception as e:
+            print(f"[BrowserPool] Error during shutdown: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+
+browser_pool = BrowserPool()
+atexit.register(browser_pool.close)
@@ -0,0 +1,89 @@
+"""Cached document provider for Tai AI, a self-evolving AI."""
+import os
+import json
+import time
+import threading
+from typing import Optional
+
+import requests
+
+
+class CachedDocument:
+    """
+    Provides the text of a project document (e.g. CHANGELOG.md) to prompt builders
+    without scraping it on every call.
+
+    - If the local copy exists, it is read once and re-read only when its mtime changes.
+    - Otherwise the remote copy is fetched over HTTP and kept for `ttl` seconds. Once the
+      TTL expires it is revalidated with its ETag, so an unchanged file costs a 304.
+    - The remote copy is also stored on disk so it survives restarts, and is served
+      stale if the network is unavailable.
+    """
+
+    def __init__(self, local_path: Optional[str], url: Optional[str], cache_path: str, ttl: float = 3600, timeout: float = 10):
+        self.local_path = local_path
+        self.url = url
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._text: Optional[str] = None
+        self._mtime: Optional[float] = None
+        self._etag: Optional[str] = None
+        self._fetched_at: float = 0.0
+        self._load_disk_cache()
+
+    def _load_disk_cache(self) -> None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as file:
+                cached = json.load(file)
+            self._text = cached.get("text")
+            self._etag = cached.get("etag")
+            self._fetched_at = cached.get("fetched_at", 0.0)
+        except (OSError, ValueError):
+            pass
+
+    def _save_disk_cache(self) -> None:
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"text": self._text, "etag": self._etag, "fetched_at": self._fetched_at}, file)
+        os.replace(tmp_path, self.cache_path)
+
+    def _read_local(self) -> Optional[str]:
+        try:
+            mtime = os.path.getmtime(self.local_path)
+        except (OSError, TypeError):
+            return None
+        if self._mtime != mtime:
+            with open(self.local_path, "r", encoding="utf-8") as file:
+                self._text = file.read()
+            self._mtime = mtime
+        return self._text
+
+    def _read_remote(self) -> Optional[str]:
+        if self._text is not None and time.time() - self._fetched_at < self.ttl:
+            return self._text
+
+        headers = {"If-None-Match": self._etag} if self._etag and self._text is not None else {}
+        try:
+            response = requests.get(self.url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                self._fetched_at = time.time()
+            else:
+                response.raise_for_status()
+                self._text = response.text
+                self._etag = response.headers.get("ETag")
+                self._fetched_at = time.time()
+            self._save_disk_cache()
+        except (requests.RequestException, OSError) as e:
+            print(f"[Documents] Could not refresh {self.url}: {e}")
+        return self._text
+
+    def get(self) -> str:
+        """Returns the document text, or 'N/A' if it is not available."""
+        with self._lock:
+            text = self._read_local()
+            if text is None and self.url:
+                text = self._read_remote()
+        return text if text is not None else "N/A"
@@ -0,0 +1,41 @@
+"""Link extraction for Tai AI, a self-evolving AI."""
+import re
+from typing import List
+
+URL_PATTERN = re.compile(
+    r"""(?:https?://|(?<![\w.@-])www\.)[^\s<>"'`\[\]{}|\\^]+"""
+    # Bare domains must not continue an identifier or e-mail address, and must end at the TLD:
+    # `response.content` or `df.apply(f)` are code, not links. TLDs that are also common
+    # attribute names (`logging.info`, `self.app`, `string.io`) additionally need a path.
+    r"""|(?<![\w.@/-])(?:[a-z0-9-]+\.)+"""
+    r"""(?:(?:com|org|net|dev|edu|gov)(?=[/:?#]|\.?(?:[^\w.(@-]|$))|(?:io|ai|co|app|me|info)(?=/))"""
+    r"""(?:[/:?#][^\s<>"'`]*)?""",
+    re.IGNORECASE
+)
+TRAILING_PUNCTUATION = ".,;:!?)'\""
+
+# Phrases that point at a link mentioned earlier in the conversation rather than in the message itself
+MEMORY_LINK_HINTS = re.compile(
+    r"\b(?:that|the|this|same|previous|earlier|last|above)\s+(?:link|url|site|website|page|article|doc|docs|documentation|repo|post)s?\b"
+    r"|\b(?:link|url|page|site)s?\s+(?:i|you|we)\s+(?:sent|shared|gave|mentioned|posted)\b",
+    re.IGNORECASE
+)
+
+def extract_urls(text: str) -> List[str]:
+    """
+    Finds explicit URLs (with or without a scheme) in text without a model call.
+    Trailing punctuation is stripped and duplicates are removed, keeping the first occurrence.
+    """
+    urls = []
+    for match in URL_PATTERN.findall(text or ""):
+        url = match
+        while url and url[-1] in TRAILING_PUNCTUATION:
+            # Keep a closing parenthesis that belongs to the URL, e.g. wiki/Python_(language)
+            if url[-1] == ")" and url.count("(") >= url.count(")"):
+                break
+            url = url[:-1]
+        if not url.lower().startswith(("http://", "https://")):
+            url = f"https://{url}"
+        if url not in urls:
+            urls.append(url)
+    return urls
@@ -0,0 +1,579 @@
+"""Memory storage backend for Tai AI, a self-evolving AI."""
+import os
+import json
+import time
+import atexit
+import sqlite3
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from brain.config import MEMORY_PATH, MEMORY_INDEX_PATH, MEMORY_INDEX_TTL, MEMORY_JOURNAL_PATH, MEMORY_FLUSH_INTERVAL, MEMORY_COMPACT_SEGMENTS
+from brain.gitbase_launcher import data_system, NotificationManager, GITHUB_TOKEN, REPO_OWNER, REPO_NAME
+
+GITHUB_API_URL = "https://api.github.com"
+SEGMENT_SEPARATOR = "__delta_"
+BASE_SEGMENT = "base"
+
+
+class MemorySyncError(RuntimeError):
+    """Raised when a memory write to GitBase could not be confirmed."""
+
+
+def segment_key(key: str, number: int) -> str:
+    """Returns the GitBase key of a delta segment of `key`."""
+    return f"{key}{SEGMENT_SEPARATOR}{number:016d}"
+
+
+def segment_number(key: str, stored_key: str) -> Optional[int]:
+    """Returns the number of the delta segment `stored_key` if it belongs to `key`, else None."""
+    prefix = f"{key}{SEGMENT_SEPARATOR}"
+    if not stored_key.startswith(prefix):
+        return None
+    try:
+        return int(stored_key[len(prefix):])
+    except ValueError:
+        return None
+
+
+class MemoryIndex:
+    """
+    A local index of the memory keys stored in GitBase, so checking whether a key
+    exists does not list the whole memory folder on GitHub.
+
+    - The index maps each key to the blob SHA of its file and is kept in a manifest
+      on disk, so it survives restarts.
+    - It is refreshed with a conditional request on the folder listing. An unchanged
+      folder answers 304 with the stored ETag, which is cheap and does not count
+      against the GitHub rate limit.
+    - Keys written by this process are recorded with `add()` straight away.
+    - A hit is answered locally. A miss is trusted only while the index is younger than
+      `ttl` seconds; otherwise the index is refreshed once before answering.
+    """
+
+    def __init__(self, token: str, owner: str, repo: str, path: str, manifest_path: str, ttl: float = 300, timeout: float = 10):
+        self.token = token
+        self.owner = owner
+        self.repo = repo
+        self.path = path
+        self.manifest_path = manifest_path
+        self.ttl = ttl
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._keys: Dict[str, Optional[str]] = {}
+        self._etag: Optional[str] = None
+        self._checked_at: float = 0.0
+        self._loaded = False
+        self._load_manifest()
+
+    # === Manifest ===
+
+    def _load_manifest(self) -> None:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+            if manifest.get("repo") != f"{self.owner}/{self.repo}/{self.path}":
+                return
+            self._keys = manifest.get("keys", {})
+            self._etag = manifest.get("etag")
+            self._checked_at = manifest.get("checked_at", 0.0)
+            self._loaded = True
+        except (OSError, ValueError):
+            pass
+
+    def _save_manifest(self) -> None:
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({
+                "repo": f"{self.owner}/{self.repo}/{self.path}",
+                "keys": self._keys,
+                "etag": self._etag,
+                "checked_at": self._checked_at
+            }, file)
+        os.replace(tmp_path, self.manifest_path)
+
+    # === Refreshing ===
+
+    def _refresh(self) -> bool:
+        url = f"{GITHUB_API_URL}/repos/{self.owner}/{self.repo}/contents/{self.path}"
+        headers = {"Accept": "application/vnd.github+json", "Authorization": f"token {self.token}"}
+        if self._etag and self._loaded:
+            headers["If-None-Match"] = self._etag
+
+        try:
+            response = requests.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 404:  # Nothing has been saved yet
+                self._keys = {}
+                self._etag = None
+            elif response.status_code != 304:
+                response.raise_for_status()
+                self._keys = {
+                    item["name"][:-len(".json")]: item.get("sha")
+                    for item in response.json()
+                    if item.get("type") == "file" and item["name"].endswith(".json")
+                }
+                self._etag = response.headers.get("ETag")
+            self._checked_at = time.time()
+            self._loaded = True
+            self._save_manifest()
+            return True
+        except (requests.RequestException, OSError, ValueError) as e:
+            print(f"[MemoryIndex] Could not refresh the index of '{self.path}': {e}")
+            return False
+
+    def refresh(self) -> bool:
+        """Brings the index up to date with GitBase. Returns False if GitHub could not be reached."""
+        with self._lock:
+            return self._refresh()
+
+    def is_fresh(self) -> bool:
+        return self._loaded and time.time() - self._checked_at < self.ttl
+
+    # === Lookups ===
+
+    def contains(self, key: str) -> Optional[bool]:
+        """
+        Returns whether `key` exists in GitBase, or None if the index cannot tell
+        (it was never loaded and GitHub is unreachable).
+        """
+        with self._lock:
+            if key in self._keys:
+                return True
+            if not self.is_fresh() and not self._refresh() and not self._loaded:
+                return None
+            return key in self._keys
+
+    def keys(self) -> List[str]:
+        """Returns every indexed key, refreshing the index first if it is stale."""
+        with self._lock:
+            if not self.is_fresh():
+                self._refresh()
+            return list(self._keys)
+
+    def add(self, key: str, sha: Optional[str] = None) -> None:
+        """Records a key this process has just written."""
+        with self._lock:
+            self._keys[key] = sha
+            if self._loaded:
+                self._save_manifest()
+
+    def remove(self, key: str) -> None:
+        """Forgets a key this process has just deleted."""
+        with self._lock:
+            self._keys.pop(key, None)
+            if self._loaded:
+                self._save_manifest()
+
+    def shas(self, key: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Returns the blob SHA of `key` and of each of its delta segments, refreshing the
+        index first if it is stale, or None if the index has never been loaded.
+        """
+        with self._lock:
+            if not self.is_fresh():
+                self._refresh()
+            if not self._loaded:
+                return None
+            return {k: sha for k, sha in self._keys.items() if k == key or segment_number(key, k) is not None}
+
+    def remote_sha(self, key: str) -> Optional[str]:
+        """
+        Asks GitHub for the current blob SHA of `key`, or None if it does not exist.
+        Used to confirm writes, since GitBase reports failed writes without raising.
+        """
+        url = f"{GITHUB_API_URL}/repos/{self.owner}/{self.repo}/contents/{self.path}/{key}.json"
+        headers = {"Accept": "application/vnd.github+json", "Authorization": f"token {self.token}"}
+        response = requests.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json().get("sha")
+
+
+memory_index = MemoryIndex(
+    token=GITHUB_TOKEN,
+    owner=REPO_OWNER,
+    repo=REPO_NAME,
+    path=MEMORY_PATH,
+    manifest_path=MEMORY_INDEX_PATH,
+    ttl=MEMORY_INDEX_TTL
+)
+
+
+class MemoryJournal:
+    """
+    A local write-back cache in front of GitBase for memory lists.
+
+    - Every memory key (e.g. `global_memory`) is mirrored in a local SQLite journal.
+      A key is loaded from GitBase once; afterwards reads are served locally.
+    - Writes only touch the journal and mark the key dirty. A background thread
+      uploads dirty keys every `flush_interval` seconds, so several turns are
+      coalesced into one upload per key. Remaining writes are flushed at shutdown.
+    - Because dirty keys live on disk, writes from a run that crashed before its
+      flush are uploaded by the next run. Entries that were never merged with the
+      GitBase copy are merged with it before being uploaded.
+
+    In GitBase a key is stored append-only: the compacted history under the key
+    itself, followed by small delta segments (`<key>__delta_<n>`) that each hold
+    only the entries of one flush. Once `compact_segments` deltas have built up,
+    they are merged back into the base file and deleted.
+
+    Entries are deduplicated by timestamp, as GitBase memory always has been.
+    """
+
+    def __init__(self, path: str, folder: str, index: MemoryIndex, flush_interval: float = 60, compact_segments: int = 16):
+        self.path = path
+        self.folder = folder
+        self.index = index
+        self.flush_interval = flush_interval
+        self.compact_segments = compact_segments
+        self._lock = threading.Lock()
+        self._flush_lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL,
+                    timestamp TEXT,
+                    entry TEXT NOT NULL,
+                    segment TEXT,  -- NULL until the entry has been uploaded, then the segment that holds it
+                    UNIQUE (key, timestamp)
+                );
+                CREATE TABLE IF NOT EXISTS keys (
+                    key TEXT PRIMARY KEY,
+                    encrypted INTEGER NOT NULL,
+                    hydrated INTEGER NOT NULL DEFAULT 0,
+                    dirty INTEGER NOT NULL DEFAULT 0,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    segments TEXT NOT NULL DEFAULT '[]',  -- delta segments on GitBase
+                    merged TEXT NOT NULL DEFAULT '[]',  -- segments merged into the base file but not deleted yet
+                    shas TEXT NOT NULL DEFAULT '{}',  -- blob SHA of each GitBase file as of the last merge or upload
+                    rewrite INTEGER NOT NULL DEFAULT 0  -- set when entries were edited or removed, which deltas cannot express
+                );
+            """)
+            self._conn.commit()
+        return self._conn
+
+    # === GitBase I/O ===
+
+    def _load_remote(self, key: str, encrypted: bool) -> List[dict]:
+        NotificationManager.hide()
+        try:
+            loaded = data_system.load_data(key=key, path=self.folder, encryption=encrypted)
+        finally:
+            NotificationManager.show()
+        value = loaded.value if loaded is not None else None
+        if isinstance(value, str):
+            value = json.loads(value)
+        return value if isinstance(value, list) else []
+
+    def _fetch_remote(self, key: str, encrypted: bool) -> Iterator[Tuple[str, List[dict]]]:
+        """Yields (segment, entries) for the base file and then each delta segment, oldest first."""
+        if self.index.contains(key) is None:  # The index is unavailable, so ask GitBase directly
+            NotificationManager.hide()
+            try:
+                stored_keys = list(data_system.get_all(encryption=encrypted, path=self.folder).keys())
+            finally:
+                NotificationManager.show()
+        else:
+            stored_keys = self.index.keys()
+
+        if key in stored_keys:
+            yield BASE_SEGMENT, self._load_remote(key, encrypted)
+        numbers = sorted(n for n in (segment_number(key, k) for k in stored_keys) if n is not None)
+        for number in numbers:
+            segment = segment_key(key, number)
+            yield segment, self._load_remote(segment, encrypted)
+
+    def _push_remote(self, key: str, entries: List[dict], encrypted: bool) -> str:
+        """
+        Uploads `entries` under `key` and confirms the write. GitBase swallows HTTP errors
+        (and may save an offline copy instead), so the file's SHA is checked afterwards;
+        MemorySyncError is raised if it did not change to the new content.
+        """
+        previous_sha = self.index.remote_sha(key)
+        NotificationManager.hide()
+        try:
+            data_system.save_data(key=key, value=entries, path=self.folder, encryption=encrypted)
+        finally:
+            NotificationManager.show()
+        sha = self.index.remote_sha(key)
+        # An unchanged SHA is only a success if the stored content already matched
+        if sha is None or (sha == previous_sha and self._load_remote(key, encrypted) != entries):
+            raise MemorySyncError(f"GitBase did not store '{key}'.")
+        self.index.add(key, sha)
+        return sha
+
+    def _delete_remote(self, key: str) -> bool:
+        """Deletes `key` from GitBase. Returns whether the file is confirmed to be gone."""
+        NotificationManager.hide()
+        try:
+            data_system.delete_data(key=key, path=self.folder)
+        finally:
+            NotificationManager.show()
+        try:
+            deleted = self.index.remote_sha(key) is None
+        except requests.RequestException:
+            deleted = False
+        if deleted:
+            self.index.remove(key)
+        return deleted
+
+    # === Journal ===
+
+    def _insert(self, conn: sqlite3.Connection, key: str, entries: List[dict], segment: Optional[str] = None) -> int:
+        added = 0
+        for entry in entries:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO entries (key, timestamp, entry, segment) VALUES (?, ?, ?, ?)",
+                (key, entry.get("timestamp"), json.dumps(entry), segment)
+            )
+            added += cursor.rowcount
+        return added
+
+    def _key_state(self, conn: sqlite3.Connection, key: str, encrypted: bool) -> Tuple[int, int]:
+        conn.execute("INSERT OR IGNORE INTO keys (key, encrypted) VALUES (?, ?)", (key, int(encrypted)))
+        return conn.execute("SELECT hydrated, dirty FROM keys WHERE key = ?", (key,)).fetchone()
+
+    def _mark_dirty(self, conn: sqlite3.Connection, key: str) -> None:
+        conn.execute("UPDATE keys SET dirty = 1, version = version + 1 WHERE key = ?", (key,))
+
+    def _record_shas(self, conn: sqlite3.Connection, key: str, update: Callable[[Dict[str, Optional[str]]], None]) -> None:
+        shas = json.loads(conn.execute("SELECT shas FROM keys WHERE key = ?", (key,)).fetchone()[0])
+        update(shas)
+        conn.execute("UPDATE keys SET shas = ? WHERE key = ?", (json.dumps(shas), key))
+
+    def _hydrate(self, key: str, encrypted: bool, force: bool = False) -> None:
+        """
+        Merges the GitBase copy of `key` under the local entries that have not been uploaded
+        yet, keeping GitBase's order first. Runs once per key unless `force` is set, which
+        re-merges a key whose GitBase files changed since.
+        """
+        with self._lock:
+            if self._key_state(self._connect(), key, encrypted)[0] and not force:
+                return
+        if force:
+            self.index.refresh()
+        shas = self.index.shas(key) or {}
+        remote = list(self._fetch_remote(key, encrypted))
+        with self._lock:
+            conn = self._connect()
+            if self._key_state(conn, key, encrypted)[0] and not force:
+                return
+            # Merged deltas waiting to be deleted are already in the base file, or were removed by a rewrite
+            merged = json.loads(conn.execute("SELECT merged FROM keys WHERE key = ?", (key,)).fetchone()[0])
+            remote = [(segment, entries) for segment, entries in remote if segment not in merged]
+            local = [json.loads(row[0]) for row in conn.execute("SELECT entry FROM entries WHERE key = ? AND segment IS NULL ORDER BY seq", (key,))]
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            for segment, entries in remote:
+                self._insert(conn, key, entries, segment)
+            if self._insert(conn, key, local):
+                self._mark_dirty(conn, key)
+            segments = [segment for segment, _ in remote if segment != BASE_SEGMENT]
+            conn.execute("UPDATE keys SET hydrated = 1, segments = ?, shas = ? WHERE key = ?", (json.dumps(segments), json.dumps(shas), key))
+            conn.commit()
+
+    def _revalidate(self, key: str, encrypted: bool) -> None:
+        """Re-merges `key` if the index shows that its GitBase files changed since they were merged."""
+        with self._lock:
+            row = self._connect().execute("SELECT hydrated, shas FROM keys WHERE key = ?", (key,)).fetchone()
+        if not row or not row[0]:
+            return
+        current = self.index.shas(key)
+        if current is None or current == json.loads(row[1]):
+            return
+        print(f"[MemoryJournal] '{key}' changed on GitBase, merging the remote copy.")
+        with self._flush_lock:
+            self._hydrate(key, encrypted, force=True)
+
+    def stream(self, key: str, encrypted: bool, batch_size: int = 256) -> Iterator[dict]:
+        """Yields the entries stored under `key` in order, reading the journal in batches."""
+        self._hydrate(key, encrypted)
+        last_seq = 0
+        while True:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT seq, entry FROM entries WHERE key = ? AND seq > ? ORDER BY seq LIMIT ?", (key, last_seq, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for _, entry in rows:
+                yield json.loads(entry)
+            last_seq = rows[-1][0]
+
+    def load(self, key: str, encrypted: bool, default: Optional[List[dict]] = None) -> List[dict]:
+        """
+        Returns the entries stored under `key`. They are fetched from GitBase the first time,
+        and merged again whenever the index shows that the GitBase copy has changed since,
+        e.g. because another machine wrote to it.
+        If the key does not exist anywhere, `default` is stored in its place and returned.
+        """
+        self._revalidate(key, encrypted)
+        entries = list(self.stream(key, encrypted))
+        if not entries and default:
+            self.append(key, default, encrypted)
+            entries = list(self.stream(key, encrypted))
+        return entries
+
+    def append(self, key: str, entries: List[dict], encrypted: bool) -> int:
+        """Adds the entries whose timestamps are not stored yet. Returns how many were added."""
+        with self._lock:
+            conn = self._connect()
+            self._key_state(conn, key, encrypted)
+            added = self._insert(conn, key, entries)
+            if added:
+                self._mark_dirty(conn, key)
+            conn.commit()
+        if added:
+            self._ensure_flusher()
+        return added
+
+    def rewrite(self, key: str, entries: List[dict], encrypted: bool) -> None:
+        """
+        Replaces every entry of `key`, e.g. after memory was edited or condensed. The next
+        flush uploads a new base file instead of a delta.
+        """
+        self._hydrate(key, encrypted)
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._insert(conn, key, entries)
+            conn.execute("UPDATE keys SET rewrite = 1 WHERE key = ?", (key,))
+            self._mark_dirty(conn, key)
+            conn.commit()
+        self._ensure_flusher()
+
+    # === Flushing ===
+
+    def _flush_key(self, key: str, encrypted: bool) -> None:
+        self._hydrate(key, encrypted)
+        self._delete_merged(key)
+        with self._lock:
+            conn = self._connect()
+            version, segments, rewrite = conn.execute("SELECT version, segments, rewrite FROM keys WHERE key = ?", (key,)).fetchone()
+            segments = json.loads(segments)
+            last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM entries WHERE key = ?", (key,)).fetchone()[0]
+            pending = [json.loads(row[0]) for row in conn.execute(
+                "SELECT entry FROM entries WHERE key = ? AND segment IS NULL AND seq <= ? ORDER BY seq", (key, last_seq)
+            )]
+
+        if rewrite or len(segments) + 1 >= self.compact_segments:
+            self.compact(key, encrypted)
+        elif pending:
+            number = max([time.time_ns() // 1000] + [segment_number(key, s) + 1 for s in segments])
+            segment = segment_key(key, number)
+            sha = self._push_remote(segment, pending, encrypted)
+            with self._lock:
+                conn = self._connect()
+                self._record_shas(conn, key, lambda shas: shas.update({segment: sha}))
+                conn.execute("UPDATE entries SET segment = ? WHERE key = ? AND segment IS NULL AND seq <= ?", (segment, key, last_seq))
+                conn.execute("UPDATE keys SET segments = ? WHERE key = ?", (json.dumps(segments + [segment]), key))
+                conn.commit()
+
+        with self._lock:
+            conn = self._connect()
+            # Writes that landed during the upload keep the key dirty for the next flush
+            conn.execute("UPDATE keys SET dirty = 0 WHERE key = ? AND version = ?", (key, version))
+            conn.commit()
+
+    def compact(self, key: str, encrypted: bool) -> None:
+        """Rewrites the base file of `key` with every entry and deletes its delta segments."""
+        self._hydrate(key, encrypted)
+        with self._lock:
+            conn = self._connect()
+            segments = json.loads(conn.execute("SELECT segments FROM keys WHERE key = ?", (key,)).fetchone()[0])
+            last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM entries WHERE key = ?", (key,)).fetchone()[0]
+            hydrated_sha = json.loads(conn.execute("SELECT shas FROM keys WHERE key = ?", (key,)).fetchone()[0]).get(key)
+        # Pushing over a base file that changed since it was merged would lose its new entries
+        if self.index.remote_sha(key) != hydrated_sha:
+            self._hydrate(key, encrypted, force=True)
+            raise MemorySyncError(f"'{key}' changed on GitBase since it was merged; merged it again, will retry.")
+        entries = list(self.stream(key, encrypted))
+
+        sha = self._push_remote(key, entries, encrypted)
+        with self._lock:
+            conn = self._connect()
+            self._record_shas(conn, key, lambda shas: shas.update({key: sha}))
+            merged = json.loads(conn.execute("SELECT merged FROM keys WHERE key = ?", (key,)).fetchone()[0])
+            conn.execute("UPDATE entries SET segment = ? WHERE key = ? AND seq <= ?", (BASE_SEGMENT, key, last_seq))
+            # The merged deltas stay recorded until their deletion is confirmed
+            conn.execute("UPDATE keys SET segments = '[]', merged = ? WHERE key = ?", (json.dumps(merged + segments), key))
+            # A rewrite that landed during the upload still needs its own
+            conn.execute("UPDATE keys SET rewrite = 0 WHERE key = ? AND NOT EXISTS (SELECT 1 FROM entries WHERE key = ? AND seq > ?)", (key, key, last_seq))
+            conn.commit()
+        self._delete_merged(key)
+        print(f"[MemoryJournal] Compacted '{key}' ({len(segments)} delta segments merged).")
+
+    def _delete_merged(self, key: str) -> None:
+        """
+        Deletes the delta segments of `key` that were merged into its base file. A delta
+        left on GitBase would be loaded again by a fresh journal, bringing back entries a
+        rewrite removed, so segments whose deletion is not confirmed are retried on the
+        next flush.
+        """
+        with self._lock:
+            row = self._connect().execute("SELECT merged FROM keys WHERE key = ?", (key,)).fetchone()
+        for segment in json.loads(row[0]) if row else []:
+            if not self._delete_remote(segment):
+                print(f"[MemoryJournal] Could not delete merged segment '{segment}', will retry.")
+                continue
+            with self._lock:
+                conn = self._connect()
+                merged = json.loads(conn.execute("SELECT merged FROM keys WHERE key = ?", (key,)).fetchone()[0])
+                conn.execute("UPDATE keys SET merged = ? WHERE key = ?", (json.dumps([s for s in merged if s != segment]), key))
+                self._record_shas(conn, key, lambda shas: shas.pop(segment, None))
+                conn.commit()
+
+    def flush(self) -> None:
+        """Uploads every dirty key to GitBase."""
+        with self._flush_lock:
+            with self._lock:
+                dirty = self._connect().execute("SELECT key, encrypted FROM keys WHERE dirty = 1 OR merged != '[]'").fetchall()
+            for key, encrypted in dirty:
+                try:
+                    self._flush_key(key, bool(encrypted))
+                except Exception as e:
+                    print(f"[MemoryJournal] Could not flush '{key}', will retry: {e}")
+
+    def _ensure_flusher(self) -> None:
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="MemoryJournal", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def recover(self) -> None:
+        """Starts flushing writes left behind by a previous run, if there are any."""
+        with self._lock:
+            pending = self._connect().execute("SELECT COUNT(*) FROM keys WHERE dirty = 1 OR merged != '[]'").fetchone()[0]
+        if pending:
+            print(f"[MemoryJournal] Recovering {pending} unflushed memory key(s).")
+            self._ensure_flusher()
+
+    def close(self) -> None:
+        """Stops the background flusher and uploads whatever is still dirty."""
+        self._stop.set()
+        self.flush()
+
+
+memory_journal = MemoryJournal(
+    path=MEMORY_JOURNAL_PATH,
+    folder=MEMORY_PATH,
+    index=memory_index,
+    flush_interval=MEMORY_FLUSH_INTERVAL,
+    compact_segments=MEMORY_COMPACT_SEGMENTS
+)
+atexit.register(memory_journal.close)
@@ -0,0 +1,330 @@
+"""In-process session memory for Tai AI, a self-evolving AI."""
+import json
+import bisect
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+FIELD_NAMES = {"timestamp": "timestamp", "Memory": "memory", "User": "user", "Tai": "tai"}
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+CHARS_PER_TOKEN = 4  # rough estimate used for prompt budgets
+
+
+class MemoryEntry:
+    """
+    One memory entry. Global entries carry `memory`; restricted (conversation)
+    entries carry `user` and `tai`. Any other keys are kept in `extra`.
+
+    Supports `entry["timestamp"]`, `entry.get()` and `entry.items()` so code
+    written against the JSON dicts keeps working.
+    """
+
+    __slots__ = ("timestamp", "memory", "user", "tai", "extra")
+
+    def __init__(self, timestamp: str, memory: Optional[str] = None, user: Optional[str] = None, tai: Optional[str] = None, extra: Optional[Dict[str, Any]] = None):
+        self.timestamp = timestamp
+        self.memory = memory
+        self.user = user
+        self.tai = tai
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MemoryEntry":
+        extra = {key: value for key, value in data.items() if key not in FIELD_NAMES} or None
+        return cls(data.get("timestamp"), data.get("Memory"), data.get("User"), data.get("Tai"), extra)
+
+    def to_dict(self) -> dict:
+        data = {"timestamp": self.timestamp}
+        if self.memory is not None:
+            data["Memory"] = self.memory
+        if self.user is not None:
+            data["User"] = self.user
+        if self.tai is not None:
+            data["Tai"] = self.tai
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def items(self):
+        return self.to_dict().items()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in FIELD_NAMES:
+            value = getattr(self, FIELD_NAMES[key])
+            return default if value is None else value
+        return (self.extra or {}).get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+
+class MemoryStore:
+    """
+    A memory list ('global' or 'restricted') kept as objects for the whole session.
+
+    Entries are only converted back to JSON-ready dicts at persistence boundaries:
+    `pending()` returns what has been added since the last `mark_persisted()`.
+    Formatting is left to a MemoryRenderer, which caches it between turns.
+    """
+
+    def __init__(self, memory_type: str, entries: Optional[List[MemoryEntry]] = None):
+        self.memory_type = memory_type
+        self._entries: List[MemoryEntry] = list(entries or [])
+        self._persisted = len(self._entries)
+        self._lock = threading.Lock()
+        self.generation = 0  # bumped whenever existing entries change, so cached renderings are dropped
+
+    @classmethod
+    def from_list(cls, memory_type: str, entries: List[dict]) -> "MemoryStore":
+        """Builds a store from loaded memory; the loaded entries count as already persisted."""
+        return cls(memory_type, [MemoryEntry.from_dict(entry) for entry in entries or []])
+
+    # === Entries ===
+
+    def append(self, entry: Union[MemoryEntry, dict]) -> MemoryEntry:
+        if isinstance(entry, dict):
+            entry = MemoryEntry.from_dict(entry)
+        with self._lock:
+            self._entries.append(entry)
+        return entry
+
+    def replace(self, entries: List[Union[MemoryEntry, dict]], persisted: bool = False) -> None:
+        """
+        Replaces every entry, e.g. after the Historian edited the memory. Pass
+        `persisted=True` if the caller has already written the new entries.
+        """
+        entries = [MemoryEntry.from_dict(entry) if isinstance(entry, dict) else entry for entry in entries]
+        with self._lock:
+            self._entries = entries
+            self._persisted = len(entries) if persisted else 0
+            self.generation += 1
+
+    def edit(self, func: Callable[[List[MemoryEntry]], List[MemoryEntry]], persist: Callable[[List[dict]], None]) -> None:
+        """
+        Replaces the entries with `func(entries)` and hands the result to `persist`,
+        both while holding the store's lock so no entry appended meanwhile is lost.
+        """
+        with self._lock:
+            entries = func(list(self._entries))
+            persist([entry.to_dict() for entry in entries])
+            self._entries = entries
+            self._persisted = len(entries)
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[MemoryEntry]:
+        return iter(list(self._entries))
+
+    def __getitem__(self, index):
+        return self._entries[index]
+
+    # === Persistence ===
+
+    def pending(self) -> Tuple[List[dict], Tuple[int, int]]:
+        """
+        Returns the entries added since they were last persisted, as JSON-ready dicts,
+        and a token to hand to `mark_persisted()` once they have been written.
+        """
+        with self._lock:
+            return [entry.to_dict() for entry in self._entries[self._persisted:]], (self.generation, len(self._entries))
+
+    def mark_persisted(self, token: Tuple[int, int]) -> None:
+        """
+        Records that the entries returned with `token` have been persisted. The token is
+        ignored if the entries were replaced or edited since, as it describes another list.
+        """
+        generation, end = token
+        with self._lock:
+            if generation == self.generation:
+                self._persisted = max(self._persisted, min(end, len(self._entries)))
+
+    def to_list(self) -> List[dict]:
+        with self._lock:
+            return [entry.to_dict() for entry in self._entries]
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_list())
+
+
+# === Patches ===
+
+PATCH_OPERATIONS = ("add", "remove", "replace", "test")
+
+
+class MemoryPatchError(ValueError):
+    """Raised when a memory patch is malformed or does not match the memory it targets."""
+
+
+def unescape_pointer(token: str) -> str:
+    """Decodes one JSON Pointer (RFC 6901) path token."""
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def parse_patch_path(path: Any) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Splits a patch path into (timestamp, field). Entries are addressed by timestamp,
+    e.g. `/2025-03-03 12:16:13` or `/2025-03-03 12:16:13/Memory`; `/-` is the end of the list.
+    """
+    if not isinstance(path, str) or not path.startswith("/"):
+        raise MemoryPatchError(f"Invalid patch path: {path!r}")
+    tokens = [unescape_pointer(token) for token in path[1:].split("/")]
+    if len(tokens) > 2 or not tokens[0]:
+        raise MemoryPatchError(f"Invalid patch path: {path!r}")
+    if tokens[0] == "-":
+        return None, None
+    return tokens[0], tokens[1] if len(tokens) == 2 else None
+
+
+def apply_patch(entries: List[MemoryEntry], patch: List[dict], timestamp: str) -> List[MemoryEntry]:
+    """
+    Applies an RFC 6902-style patch to memory entries and returns the new list.
+
+    Supported operations:
+    - `add` to `/-` appends a new entry; it is given `timestamp`, moved forward a
+      second at a time if that timestamp is already taken.
+    - `remove` of `/<timestamp>` deletes that entry.
+    - `replace` of `/<timestamp>` or `/<timestamp>/<field>` overwrites an entry or one field.
+    - `test` of `/<timestamp>/<field>` checks a field's value before the patch applies.
+
+    The patch is validated as a whole: if any operation is malformed or refers to an
+    entry that does not exist, MemoryPatchError is raised and nothing is changed.
+    """
+    if not isinstance(patch, list):
+        raise MemoryPatchError("A memory patch must be a JSON list of operations.")
+
+    entries = [MemoryEntry.from_dict(entry.to_dict()) for entry in entries]
+    by_timestamp = {entry.timestamp: entry for entry in entries}
+    removed = set()
+
+    for operation in patch:
+        if not isinstance(operation, dict) or operation.get("op") not in PATCH_OPERATIONS:
+            raise MemoryPatchError(f"Unsupported patch operation: {operation!r}")
+        op = operation["op"]
+        target, field = parse_patch_path(operation.get("path"))
+        value = operation.get("value")
+
+        if op == "add":
+            if target is not None or not isinstance(value, dict) or not isinstance(value.get("Memory"), str):
+                raise MemoryPatchError("'add' must append to '/-' an object with a 'Memory' string.")
+            entry = MemoryEntry.from_dict({**value, "timestamp": timestamp})
+            while entry.timestamp in by_timestamp:
+                entry.timestamp = (entry_time(entry) + timedelta(seconds=1)).strftime(TIMESTAMP_FORMAT)
+            entries.append(entry)
+            by_timestamp[entry.timestamp] = entry
+            continue
+
+        entry = by_timestamp.get(target)
+        if entry is None or target in removed:
+            raise MemoryPatchError(f"'{op}' refers to a missing entry: {operation.get('path')!r}")
+        if field == "timestamp":
+            raise MemoryPatchError("Entry timestamps cannot be changed.")
+
+        if op == "remove":
+            if field is not None:
+                raise MemoryPatchError("'remove' must target a whole entry.")
+            removed.add(target)
+        elif op == "replace":
+            if field is None:
+                if not isinstance(value, dict):
+                    raise MemoryPatchError("Replacing an entry requires an object value.")
+                replacement = MemoryEntry.from_dict({**value, "timestamp": target})
+                entries[entries.index(entry)] = replacement
+                by_timestamp[target] = replacement
+            else:
+                if not isinstance(value, (str, int, float, bool)):
+                    raise MemoryPatchError(f"Invalid value for {operation.get('path')!r}.")
+                data = entry.to_dict()
+                data[field] = value
+                replacement = MemoryEntry.from_dict(data)
+                entries[entries.index(entry)] = replacement
+                by_timestamp[target] = replacement
+        elif op == "test":
+            if field is None or entry.get(field) != value:
+                raise MemoryPatchError(f"Test failed for {operation.get('path')!r}.")
+
+    return [entry for entry in entries if entry.timestamp not in removed]
+
+
+class MemoryRenderer:
+    """
+    Formats a MemoryStore as text and keeps the result between calls.
+
+    The formatted text of every entry rendered so far is kept as one string along
+    with the offset where each entry starts, so a call after new entries were added
+    only formats those entries. The cache is dropped if the store is replaced or
+    its entries are edited.
+
+    `render_tail()` renders only the most recent entries, within a token budget,
+    and reuses the same cached text.
+    """
+
+    def __init__(self, format_entry: Callable[[MemoryEntry], str], separator: str = "\n"):
+        self.format_entry = format_entry
+        self.separator = separator
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, store: Optional[MemoryStore]) -> None:
+        self._store = store
+        self._generation = store.generation if store is not None else -1
+        self._text = ""
+        self._offsets: List[int] = []  # where each entry's text starts in _text
+
+    def _sync(self, store: MemoryStore) -> None:
+        if store is not self._store or store.generation != self._generation or len(store) < len(self._offsets):
+            self._reset(store)
+        new_entries = store[len(self._offsets):]
+        if not new_entries:
+            return
+        parts = []
+        offset = len(self._text)
+        for entry in new_entries:
+            if self._offsets or parts:
+                parts.append(self.separator)
+                offset += len(self.separator)
+            line = self.format_entry(entry)
+            self._offsets.append(offset)
+            parts.append(line)
+            offset += len(line)
+        self._text += "".join(parts)
+
+    def render(self, store: MemoryStore) -> str:
+        """Returns the formatted text of every entry in `store`."""
+        with self._lock:
+            self._sync(store)
+            return self._text
+
+    def render_tail(self, store: MemoryStore, minutes: float, token_budget: int, now: Optional[datetime] = None) -> Tuple[str, int]:
+        """
+        Returns the formatted text of the entries from the last `minutes` minutes, trimmed
+        from the oldest end to fit `token_budget`, and the index of the first entry shown.
+        The newest entry is always shown.
+        """
+        with self._lock:
+            self._sync(store)
+            count = len(self._offsets)
+            if count == 0:
+                return "", 0
+
+            cutoff = (now or datetime.now()) - timedelta(minutes=minutes)
+            start = count - 1
+            while start > 0 and entry_time(store[start - 1]) >= cutoff:
+                start -= 1
+
+            # Skip the oldest entries of the window until the rest fits the budget
+            earliest_offset = len(self._text) - token_budget * CHARS_PER_TOKEN
+            start = max(start, min(bisect.bisect_left(self._offsets, earliest_offset), count - 1))
+            return self._text[self._offsets[start]:], start
+
+
+def entry_time(entry: MemoryEntry) -> datetime:
+    """Returns when an entry was written, or datetime.min if its timestamp cannot be read."""
+    try:
+        return datetime.strptime(entry.timestamp, TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return datetime.min
@@ -1,32 +1,32 @@
-from buildeasy import modifiable
-
-@modifiable
-class Timpestamps:
-    def __init__(self):
-        self.timestamps = """
-# ++-------- TIMESTAMPS --------++
-# timestamp: 2025-04-08 10:40:11
-# ++-------- TIMESTAMPS --------++
-        """
-
-# ++-------- Exceptions --------++
-class ModifiableException(Exception):
-    def __init__(self, message):
-        super().__init__(message)
-
-class ModifiableError(Exception):
-    def __init__(self, message):
-        super().__init__(message)
-# ++-------- Exceptions --------++
-
-# ++-------- CODE --------++
-@modifiable
-class Mind:
-    """
-    A class that can be modified by the AI. This class holds all code written by the AI itself, and can only be used to learn new things/improve itself.
-    For example, it can learn to read images, make videos, etc., by adding functions.
-    """
-    def __init__(self, tai):
-        self.tai = tai
-
+from buildeasy import modifiable
+
+@modifiable
+class Timpestamps:
+    def __init__(self):
+        self.timestamps = """
+# ++-------- TIMESTAMPS --------++
+# timestamp: 2025-04-08 10:40:11
+# ++-------- TIMESTAMPS --------++
+        """
+
+# ++-------- Exceptions --------++
+class ModifiableException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+class ModifiableError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+# ++-------- Exceptions --------++
+
+# ++-------- CODE --------++
+@modifiable
+class Mind:
+    """
+    A class that can be modified by the AI. This class holds all code written by the AI itself, and can only be used to learn new things/improve itself.
+    For example, it can learn to read images, make videos, etc., by adding functions.
+    """
+    def __init__(self, tai):
+        self.tai = tai
+
 # ++-------- CODE --------++
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""Prompt templates for Tai AI, a self-evolving AI."""
+import threading
+from string import Formatter
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+Section = Union[str, Callable[[], str]]
+
+
+class PromptTemplate:
+    """
+    A prompt made of static sections and dynamic slots, compiled once.
+
+    `template` uses `{name}` placeholders. Names found in `sections` are static:
+    their text (a string, or a callable such as `changelog.get`) is merged into the
+    surrounding literal text when the template is compiled. Every other name is a
+    dynamic slot filled by `render()`, either from its keyword arguments or from
+    `defaults` (callables evaluated once per render, e.g. the current time).
+
+    A callable section is re-checked on every render, but the template is only
+    recompiled if it returned a different object, so an unchanged changelog costs
+    nothing. Putting the static sections first gives every prompt the same long
+    prefix, which `split()` returns separately so it can be sent as a cached system
+    instruction while only the rest is sent per call.
+    """
+
+    def __init__(self, template: str, sections: Optional[Dict[str, Section]] = None, defaults: Optional[Dict[str, Callable[[], str]]] = None):
+        self.template = template
+        self.sections = dict(sections or {})
+        self.defaults = dict(defaults or {})
+        self._lock = threading.Lock()
+        self._section_values: Optional[Tuple[str, ...]] = None
+        self._parts: List[Tuple[bool, str]] = []  # (is_slot, literal text or slot name)
+        self.slots: List[str] = []
+
+    def _evaluate_sections(self) -> Tuple[str, ...]:
+        return tuple(section() if callable(section) else section for section in self.sections.values())
+
+    def _compile(self, section_values: Tuple[str, ...]) -> None:
+        static = dict(zip(self.sections, section_values))
+        parts: List[Tuple[bool, str]] = []
+        literal: List[str] = []
+        slots: List[str] = []
+        for text, name, _, _ in Formatter().parse(self.template):
+            literal.append(text)
+            if name is None:
+                continue
+            if name in static:
+                literal.append(str(static[name]))
+            else:
+                parts.append((False, "".join(literal)))
+                parts.append((True, name))
+                literal = []
+                if name not in slots:
+                    slots.append(name)
+        parts.append((False, "".join(literal)))
+
+        self._parts = [part for part in parts if part[0] or part[1]]
+        self._section_values = section_values
+        self.slots = slots
+
+    def _compiled(self) -> List[Tuple[bool, str]]:
+        section_values = self._evaluate_sections()
+        with self._lock:
+            if self._section_values is None or any(a is not b for a, b in zip(section_values, self._section_values)):
+                self._compile(section_values)
+            return self._parts
+
+    @property
+    def static_prefix(self) -> str:
+        """The text before the first dynamic slot, identical for every render."""
+        parts = self._compiled()
+        return parts[0][1] if parts and not parts[0][0] else ""
+
+    def split(self, **values: str) -> Tuple[str, str]:
+        """Renders the prompt and returns it as (static prefix, the rest)."""
+        parts = self._compiled()
+        prefix = parts[0][1] if parts and not parts[0][0] else ""
+        rest = parts[1:] if prefix else parts
+
+        filled = {}
+        for name in self.slots:
+            if name in values:
+                filled[name] = values[name]
+            elif name in self.defaults:
+                filled[name] = self.defaults[name]()
+            else:
+                raise ValueError(f"Prompt slot '{name}' was not filled.")
+        return prefix, "".join(str(filled[text]) if is_slot else text for is_slot, text in rest)
+
+    def render(self, **values: str) -> str:
+        """Returns the full prompt with every dynamic slot filled."""
+        prefix, rest = self.split(**values)
+        return prefix + rest
@@ -0,0 +1,125 @@
+"""Memory retrieval index for Tai AI, a self-evolving AI."""
+import re
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from brain.memory_store import MemoryStore
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOP_WORDS = frozenset(
+    "a an and are as at be but by do for from has have he her his i if in is it its me my no not of on or our "
+    "she so that the their them they this to was we were what when which who will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercases `text` and splits it into words, dropping common stop words."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def entry_text(entry: dict) -> str:
+    """Returns the searchable text of a memory entry: every string field except its timestamp."""
+    return " ".join(str(value) for key, value in entry.items() if key != "timestamp" and isinstance(value, (str, int, float)))
+
+
+class MemoryRetriever:
+    """
+    A BM25 index over memory entries, used to pick the entries relevant to a
+    message instead of putting the whole history into every prompt.
+
+    Memory lists only ever grow at the end, so `sync()` indexes just the entries
+    added since the last call. It rebuilds when the list comes from a different
+    store or the store's generation changed, i.e. its entries were edited. Postings
+    are kept per term; document lengths live in a NumPy array, and scoring is
+    vectorized over each query term's postings.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._vocabulary: Dict[str, int] = {}
+        self._postings: List[List[int]] = []  # term id -> document ids
+        self._frequencies: List[List[int]] = []  # term id -> term frequency in each of those documents
+        self._lengths = np.zeros(64, dtype=np.float32)
+        self._count = 0
+        self._source: Optional[Tuple[object, int]] = None  # (store, generation) the index was built from
+
+    def _add(self, entry: dict) -> None:
+        doc_id = self._count
+        counts: Dict[int, int] = {}
+        tokens = tokenize(entry_text(entry))
+        for token in tokens:
+            term_id = self._vocabulary.get(token)
+            if term_id is None:
+                term_id = self._vocabulary[token] = len(self._postings)
+                self._postings.append([])
+                self._frequencies.append([])
+            counts[term_id] = counts.get(term_id, 0) + 1
+        for term_id, count in counts.items():
+            self._postings[term_id].append(doc_id)
+            self._frequencies[term_id].append(count)
+
+        if doc_id == len(self._lengths):
+            self._lengths = np.concatenate([self._lengths, np.zeros_like(self._lengths)])
+        self._lengths[doc_id] = len(tokens)
+        self._count += 1
+
+    def sync(self, entries: List[dict], store: Optional[MemoryStore] = None) -> None:
+        """
+        Brings the index up to date with `entries`, indexing only what was appended.
+        `store` is the MemoryStore the entries were taken from, if `entries` is not the
+        store itself; without one the index is rebuilt, since edits cannot be detected.
+        """
+        if store is None and isinstance(entries, MemoryStore):
+            store = entries
+        with self._lock:
+            source = (store, store.generation) if store is not None else None
+            if source is None or self._source is None or source[0] is not self._source[0] \
+                    or source[1] != self._source[1] or len(entries) < self._count:
+                self._reset()
+                self._source = source
+            for entry in entries[self._count:]:
+                self._add(entry)
+
+    def scores(self, query: str) -> np.ndarray:
+        """Returns the BM25 score of every indexed entry for `query`."""
+        with self._lock:
+            scores = np.zeros(self._count, dtype=np.float32)
+            if self._count == 0:
+                return scores
+            lengths = self._lengths[:self._count]
+            average_length = max(float(lengths.mean()), 1.0)
+            for token in set(tokenize(query)):
+                term_id = self._vocabulary.get(token)
+                if term_id is None:
+                    continue
+                doc_ids = np.asarray(self._postings[term_id], dtype=np.int64)
+                frequencies = np.asarray(self._frequencies[term_id], dtype=np.float32)
+                idf = math.log(1 + (self._count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * lengths[doc_ids] / average_length)
+                scores[doc_ids] += idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+            return scores
+
+    def select(self, entries: List[dict], query: str, top_k: int, recent: int, store: Optional[MemoryStore] = None) -> List[dict]:
+        """
+        Returns the last `recent` entries plus the `top_k` older entries that best match
+        `query`, in their original order. If that is every entry, `entries` itself is returned.
+        `store` is passed on to `sync()`.
+        """
+        if len(entries) <= top_k + recent:
+            return entries
+        self.sync(entries, store)
+        cutoff = len(entries) - recent if recent > 0 else len(entries)
+        scores = self.scores(query)[:cutoff]
+        chosen = set()
+        if top_k > 0 and len(scores):
+            candidates = np.argsort(-scores, kind="stable")[:top_k]
+            chosen = {int(i) for i in candidates if scores[i] > 0}
+        return [entry for i, entry in enumerate(entries) if i in chosen or i >= cutoff]
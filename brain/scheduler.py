@@ -0,0 +1,125 @@
+"""Stage scheduler for Tai AI, a self-evolving AI."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Any
+
+
+class Stage:
+    """A single named unit of work and the names of the stages it waits on."""
+
+    def __init__(self, name: str, func: Callable[..., Any], after: Optional[List[str]] = None):
+        self.name = name
+        self.func = func
+        self.after = list(after or [])
+
+
+class StageScheduler:
+    """
+    Runs a set of dependent stages, starting each one as soon as every stage
+    it depends on has finished. Independent stages run concurrently.
+
+    A stage function receives the results of its dependencies as keyword
+    arguments named after those stages, for example a stage added with
+    `after=["initial"]` is called as `func(initial=<result of initial>)`.
+
+    Per-stage wall-clock timings are recorded in `timings` and can be printed
+    with `report()`.
+    """
+
+    def __init__(self, label: str = "Scheduler", max_workers: int = 8):
+        self.label = label
+        self.max_workers = max_workers
+        self.stages: Dict[str, Stage] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}
+        self.total_time: float = 0.0
+        self._lock = threading.Lock()
+
+    def add_stage(self, name: str, func: Callable[..., Any], after: Optional[List[str]] = None) -> "StageScheduler":
+        """Registers a stage. Returns the scheduler so calls can be chained."""
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already registered.")
+        self.stages[name] = Stage(name, func, after)
+        return self
+
+    def _check_graph(self) -> None:
+        """Ensures every dependency exists and that the stages form no cycle."""
+        for stage in self.stages.values():
+            for dep in stage.after:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'.")
+
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage '{name}' is part of a dependency cycle.")
+            visiting.add(name)
+            for dep in self.stages[name].after:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def _run_stage(self, stage: Stage) -> Any:
+        kwargs = {dep: self.results[dep] for dep in stage.after}
+        start_time = time.time()
+        try:
+            return stage.func(**kwargs)
+        finally:
+            with self._lock:
+                self.timings[stage.name] = time.time() - start_time
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Executes all stages and returns a dict of stage name -> result.
+
+        If a stage raises, no further stages are started, already running
+        stages are allowed to finish, and the first exception is re-raised.
+        """
+        self._check_graph()
+        self.results.clear()
+        self.timings.clear()
+
+        start_time = time.time()
+        pending = dict(self.stages)
+        running: Dict[Future, str] = {}
+        error: Optional[BaseException] = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                if error is None:
+                    ready = [s for s in pending.values() if all(dep in self.results for dep in s.after)]
+                    for stage in ready:
+                        del pending[stage.name]
+                        running[executor.submit(self._run_stage, stage)] = stage.name
+
+                if not running:
+                    break
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    exc = future.exception()
+                    if exc is not None:
+                        if error is None:
+                            error = exc
+                    else:
+                        self.results[name] = future.result()
+
+        self.total_time = time.time() - start_time
+        if error is not None:
+            raise error
+        return self.results
+
+    def report(self) -> None:
+        """Prints the recorded per-stage timings and the total run time."""
+        for name in self.stages:
+            if name in self.timings:
+                print("[{}] Stage '{}' finished. (Time: {:.2f} seconds)".format(self.label, name, self.timings[name]))
+        print("[{}] All stages finished. (Time: {:.2f} seconds)".format(self.label, self.total_time))
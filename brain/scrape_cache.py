@@ -0,0 +1,174 @@
+"""Persistent scrape cache for Tai AI, a self-evolving AI."""
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+TRACKING_PARAMS = re.compile(r"^(?:utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref_src)$", re.IGNORECASE)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes a URL so trivially different spellings share one cache entry.
+    Lowercases the scheme and host, drops default ports, fragments and tracking
+    parameters, and sorts the query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not (scheme == "http" and parts.port == 80) and not (scheme == "https" and parts.port == 443):
+        host = f"{host}:{parts.port}"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not TRACKING_PARAMS.match(k))
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def content_hash(text: str) -> str:
+    """Returns the SHA-256 hex digest of the cleaned text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def expiry_from_headers(headers: Dict[str, str], now: float, default_ttl: float) -> Optional[float]:
+    """
+    Works out when a response stops being fresh from its HTTP cache headers.
+    Returns None if the response must not be stored at all (`no-store`).
+    """
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return now
+
+    max_age = re.search(r"(?:s-maxage|max-age)\s*=\s*(\d+)", cache_control)
+    if max_age:
+        return now + int(max_age.group(1))
+
+    if "expires" in headers:
+        try:
+            return parsedate_to_datetime(headers["expires"]).timestamp()
+        except (TypeError, ValueError):
+            return now
+    return now + default_ttl
+
+
+class CachedPage:
+    """A cached scrape result."""
+
+    __slots__ = ("url", "text", "fetched_at", "expires_at", "content_hash", "etag", "last_modified")
+
+    def __init__(self, url: str, text: str, fetched_at: float, expires_at: float, content_hash: str, etag: Optional[str], last_modified: Optional[str]):
+        self.url = url
+        self.text = text
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+        self.content_hash = content_hash
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class ScrapeCache:
+    """
+    An SQLite-backed cache of cleaned page text keyed by normalized URL.
+
+    Entries expire according to the page's Cache-Control/Expires headers, or
+    `default_ttl` seconds if it sent none. Once the stored text exceeds `max_bytes`,
+    the least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, default_ttl: float = 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Returns the cached entry for `url`, fresh or stale, or None if there is none."""
+        key = normalize_url(url)
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT text, fetched_at, expires_at, content_hash, etag, last_modified FROM pages WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), key))
+            conn.commit()
+        return CachedPage(key, *row)
+
+    def put(self, url: str, text: str, headers: Optional[Dict[str, str]] = None) -> Optional[CachedPage]:
+        """
+        Stores the cleaned text for `url`. Returns the stored entry, or None if the
+        response headers forbid storing it.
+        """
+        now = time.time()
+        expires_at = expiry_from_headers(headers, now, self.default_ttl)
+        if expires_at is None:
+            return None
+
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        page = CachedPage(normalize_url(url), text, now, expires_at, content_hash(text), headers.get("etag"), headers.get("last-modified"))
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (page.url, page.text, page.fetched_at, page.expires_at, page.content_hash, page.etag, page.last_modified, size, now)
+            )
+            self._evict(conn)
+            conn.commit()
+        return page
+
+    def refresh(self, url: str, headers: Optional[Dict[str, str]] = None) -> None:
+        """Marks an entry as fresh again after the server confirmed it is unchanged."""
+        now = time.time()
+        expires_at = expiry_from_headers(headers, now, self.default_ttl) or now
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE pages SET fetched_at = ?, expires_at = ?, last_access = ? WHERE url = ?", (now, expires_at, now, normalize_url(url)))
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in conn.execute("SELECT url, size FROM pages ORDER BY last_access ASC").fetchall():
+            conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM pages")
+            conn.commit()
@@ -0,0 +1,55 @@
+"""Tests for brain.links."""
+from brain.links import URL_PATTERN, extract_urls
+
+
+def test_extracts_urls_with_and_without_scheme():
+    text = "See https://docs.python.org/3/library/re.html, www.example.org and github.com/user/repo."
+    assert extract_urls(text) == [
+        "https://docs.python.org/3/library/re.html",
+        "https://www.example.org",
+        "https://github.com/user/repo",
+    ]
+
+
+def test_bare_domain_at_end_of_sentence():
+    assert extract_urls("Have you seen example.com?") == ["https://example.com"]
+    assert extract_urls("I like example.org.") == ["https://example.org"]
+    assert extract_urls("example.com:8080/status") == ["https://example.com:8080/status"]
+
+
+def test_keeps_parentheses_that_belong_to_the_url():
+    text = "(see https://en.wikipedia.org/wiki/Python_(programming_language))"
+    assert extract_urls(text) == ["https://en.wikipedia.org/wiki/Python_(programming_language)"]
+
+
+def test_removes_duplicates():
+    assert extract_urls("example.com and https://example.com") == ["https://example.com"]
+
+
+def test_ignores_attribute_access_and_method_calls():
+    assert extract_urls("why does response.content return bytes?") == []
+    assert extract_urls("use df.apply(f)") == []
+    assert extract_urls("call client.app(config) first") == []
+    assert extract_urls("read it with file.io.read()") == []
+
+
+def test_ambiguous_tlds_need_a_scheme_www_or_path():
+    assert extract_urls("use logging.info for messages") == []
+    assert extract_urls("register routes on self.app") == []
+    assert extract_urls("call logger.info, then return") == []
+    assert extract_urls("torch.io and string.io are modules") == []
+    assert extract_urls("pass request.co to the handler") == []
+    assert extract_urls("the model lives in self.ai.me") == []
+    assert extract_urls("docs at example.io/guide") == ["https://example.io/guide"]
+    assert extract_urls("try https://example.ai") == ["https://example.ai"]
+    assert extract_urls("try www.example.app") == ["https://www.example.app"]
+
+
+def test_ignores_domains_inside_identifiers_and_addresses():
+    assert extract_urls("mail me at someone@example.com") == []
+    assert extract_urls("the api_example.com_key variable") == []
+
+
+def test_pattern_finds_links_in_memory_text():
+    assert URL_PATTERN.search("User: check out example.dev for the docs")
+    assert not URL_PATTERN.search("User: why does response.content return bytes?")
@@ -0,0 +1,147 @@
+"""Tests for brain.memory_backend."""
+import hashlib
+import json
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("gitbase")
+
+from brain import memory_backend
+from brain.memory_backend import MemoryJournal, MemorySyncError, segment_number
+
+
+class LoadedValue:
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeDataSystem:
+    """Stands in for GitBase's DataSystem, keeping files in a dict."""
+
+    def __init__(self):
+        self.files = {}
+        self.saves = []
+
+    def get_all(self, encryption, path):
+        return dict.fromkeys(self.files, None)
+
+    def load_data(self, key, path, encryption):
+        return LoadedValue(self.files[key]) if key in self.files else None
+
+    def save_data(self, key, value, path, encryption):
+        self.files[key] = json.loads(json.dumps(value))
+        self.saves.append(key)
+
+    def delete_data(self, key, path):
+        self.files.pop(key, None)
+
+
+class FakeIndex:
+    """Answers index lookups straight from the fake data system, with a SHA per file content."""
+
+    def __init__(self, data_system):
+        self.data_system = data_system
+
+    def _sha(self, key):
+        if key not in self.data_system.files:
+            return None
+        return hashlib.sha1(json.dumps(self.data_system.files[key]).encode()).hexdigest()
+
+    def contains(self, key):
+        return key in self.data_system.files
+
+    def keys(self):
+        return list(self.data_system.files)
+
+    def add(self, key, sha=None):
+        pass
+
+    def remove(self, key):
+        pass
+
+    def refresh(self):
+        return True
+
+    def shas(self, key):
+        return {k: self._sha(k) for k in self.data_system.files if k == key or segment_number(key, k) is not None}
+
+    def remote_sha(self, key):
+        return self._sha(key)
+
+
+class Notifications:
+    hide = show = staticmethod(lambda: None)
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    data_system = FakeDataSystem()
+    monkeypatch.setattr(memory_backend, "data_system", data_system)
+    monkeypatch.setattr(memory_backend, "NotificationManager", Notifications)
+    return data_system
+
+
+def make_journal(tmp_path, remote, compact_segments=16):
+    return MemoryJournal(str(tmp_path / "journal.sqlite3"), "memory", FakeIndex(remote), flush_interval=3600, compact_segments=compact_segments)
+
+
+def memories(entries):
+    return [entry["Memory"] for entry in entries]
+
+
+def test_flush_uploads_only_new_entries_as_a_delta(tmp_path, remote):
+    remote.files["global"] = [{"timestamp": "1", "Memory": "a"}]
+    journal = make_journal(tmp_path, remote)
+    assert memories(journal.load("global", False)) == ["a"]
+
+    journal.append("global", [{"timestamp": "2", "Memory": "b"}, {"timestamp": "1", "Memory": "duplicate"}], False)
+    journal.flush()
+    deltas = [key for key in remote.files if segment_number("global", key) is not None]
+    assert len(deltas) == 1
+    assert remote.files[deltas[0]] == [{"timestamp": "2", "Memory": "b"}]
+    assert remote.files["global"] == [{"timestamp": "1", "Memory": "a"}]
+
+    # A fresh journal rebuilds the same memory from the base file and its delta
+    other = MemoryJournal(str(tmp_path / "other.sqlite3"), "memory", FakeIndex(remote))
+    assert memories(other.load("global", False)) == ["a", "b"]
+
+
+def test_flush_compacts_once_enough_deltas_built_up(tmp_path, remote):
+    journal = make_journal(tmp_path, remote, compact_segments=3)
+    for number in range(3):
+        journal.append("global", [{"timestamp": str(number), "Memory": str(number)}], False)
+        journal.flush()
+    assert list(remote.files) == ["global"]
+    assert memories(remote.files["global"]) == ["0", "1", "2"]
+
+
+def test_rewrite_replaces_the_base_file_and_drops_deltas(tmp_path, remote):
+    journal = make_journal(tmp_path, remote)
+    journal.append("global", [{"timestamp": "1", "Memory": "a"}], False)
+    journal.flush()
+    journal.rewrite("global", [{"timestamp": "2", "Memory": "b"}], False)
+    journal.flush()
+    assert remote.files == {"global": [{"timestamp": "2", "Memory": "b"}]}
+
+
+def test_load_merges_entries_written_elsewhere(tmp_path, remote):
+    remote.files["global"] = [{"timestamp": "1", "Memory": "a"}]
+    journal = make_journal(tmp_path, remote)
+    journal.load("global", False)
+    journal.append("global", [{"timestamp": "3", "Memory": "local"}], False)
+    remote.files["global"].append({"timestamp": "2", "Memory": "remote"})
+    assert memories(journal.load("global", False)) == ["a", "remote", "local"]
+
+
+def test_compact_does_not_overwrite_a_changed_base_file(tmp_path, remote):
+    remote.files["global"] = [{"timestamp": "1", "Memory": "a"}]
+    journal = make_journal(tmp_path, remote)
+    journal.load("global", False)
+    journal.append("global", [{"timestamp": "3", "Memory": "local"}], False)
+    remote.files["global"].append({"timestamp": "2", "Memory": "remote"})
+
+    with pytest.raises(MemorySyncError):
+        journal.compact("global", False)
+    journal.compact("global", False)
+    assert memories(remote.files["global"]) == ["a", "remote", "local"]
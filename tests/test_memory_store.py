@@ -0,0 +1,101 @@
+"""Tests for brain.memory_store."""
+from datetime import datetime
+
+import pytest
+
+from brain.memory_store import MemoryEntry, MemoryPatchError, MemoryRenderer, MemoryStore, apply_patch
+
+
+def make_entries():
+    return [
+        MemoryEntry("2025-03-03 12:00:00", memory="likes tea"),
+        MemoryEntry("2025-03-03 12:05:00", memory="lives in Oslo"),
+    ]
+
+
+def test_patch_adds_replaces_and_removes():
+    patched = apply_patch(make_entries(), [
+        {"op": "test", "path": "/2025-03-03 12:00:00/Memory", "value": "likes tea"},
+        {"op": "replace", "path": "/2025-03-03 12:00:00/Memory", "value": "likes coffee"},
+        {"op": "remove", "path": "/2025-03-03 12:05:00"},
+        {"op": "add", "path": "/-", "value": {"Memory": "has a cat"}},
+    ], timestamp="2025-03-03 13:00:00")
+    assert [(entry.timestamp, entry.memory) for entry in patched] == [
+        ("2025-03-03 12:00:00", "likes coffee"),
+        ("2025-03-03 13:00:00", "has a cat"),
+    ]
+
+
+def test_patch_is_rejected_as_a_whole():
+    entries = make_entries()
+    with pytest.raises(MemoryPatchError):
+        apply_patch(entries, [
+            {"op": "replace", "path": "/2025-03-03 12:00:00/Memory", "value": "likes coffee"},
+            {"op": "test", "path": "/2025-03-03 12:05:00/Memory", "value": "lives in Bergen"},
+        ], timestamp="2025-03-03 13:00:00")
+    assert [entry.memory for entry in entries] == ["likes tea", "lives in Oslo"]
+
+
+def test_patch_with_a_missing_timestamp_is_rejected():
+    with pytest.raises(MemoryPatchError):
+        apply_patch(make_entries(), [{"op": "remove", "path": "/2025-01-01 00:00:00"}], timestamp="2025-03-03 13:00:00")
+    with pytest.raises(MemoryPatchError):
+        apply_patch(make_entries(), [
+            {"op": "remove", "path": "/2025-03-03 12:00:00"},
+            {"op": "replace", "path": "/2025-03-03 12:00:00/Memory", "value": "gone"},
+        ], timestamp="2025-03-03 13:00:00")
+
+
+def test_timestamps_cannot_be_changed():
+    with pytest.raises(MemoryPatchError):
+        apply_patch(make_entries(), [
+            {"op": "replace", "path": "/2025-03-03 12:00:00/timestamp", "value": "2025-03-04 12:00:00"},
+        ], timestamp="2025-03-03 13:00:00")
+    patched = apply_patch(make_entries(), [
+        {"op": "replace", "path": "/2025-03-03 12:00:00", "value": {"Memory": "likes coffee", "timestamp": "2025-03-04 12:00:00"}},
+    ], timestamp="2025-03-03 13:00:00")
+    assert patched[0].timestamp == "2025-03-03 12:00:00"
+
+
+def test_added_entries_skip_taken_timestamps():
+    patched = apply_patch(make_entries(), [
+        {"op": "add", "path": "/-", "value": {"Memory": "first"}},
+        {"op": "add", "path": "/-", "value": {"Memory": "second"}},
+    ], timestamp="2025-03-03 12:05:00")
+    assert [entry.timestamp for entry in patched[2:]] == ["2025-03-03 12:05:01", "2025-03-03 12:05:02"]
+
+
+def make_store(*timestamps):
+    return MemoryStore("temporary", [MemoryEntry(timestamp, memory=f"entry {i}") for i, timestamp in enumerate(timestamps)])
+
+
+def test_render_tail_keeps_the_recent_window():
+    store = make_store("2025-03-03 11:00:00", "2025-03-03 11:55:00", "2025-03-03 12:00:00")
+    renderer = MemoryRenderer(lambda entry: entry.memory)
+    tail, start = renderer.render_tail(store, minutes=10, token_budget=1000, now=datetime(2025, 3, 3, 12, 1))
+    assert (tail, start) == ("entry 1\nentry 2", 1)
+
+
+def test_render_tail_trims_the_oldest_entries_to_the_budget():
+    store = make_store("2025-03-03 12:00:00", "2025-03-03 12:00:01", "2025-03-03 12:00:02")
+    renderer = MemoryRenderer(lambda entry: entry.memory * 3)
+    tail, start = renderer.render_tail(store, minutes=10, token_budget=10, now=datetime(2025, 3, 3, 12, 1))
+    assert start == 2
+    assert tail == "entry 2" * 3
+
+
+def test_render_tail_always_shows_the_newest_entry():
+    store = make_store("2025-03-03 08:00:00", "2025-03-03 09:00:00")
+    renderer = MemoryRenderer(lambda entry: entry.memory)
+    assert renderer.render_tail(store, minutes=10, token_budget=0, now=datetime(2025, 3, 3, 12, 0)) == ("entry 1", 1)
+    assert renderer.render_tail(make_store(), minutes=10, token_budget=100) == ("", 0)
+
+
+def test_render_tail_picks_up_appended_entries():
+    store = make_store("2025-03-03 12:00:00")
+    renderer = MemoryRenderer(lambda entry: entry.memory)
+    now = datetime(2025, 3, 3, 12, 1)
+    assert renderer.render_tail(store, minutes=10, token_budget=100, now=now) == ("entry 0", 0)
+    store.append(MemoryEntry("2025-03-03 12:00:30", memory="entry 1"))
+    assert renderer.render_tail(store, minutes=10, token_budget=100, now=now) == ("entry 0\nentry 1", 0)
+    assert renderer.render(store) == "entry 0\nentry 1"
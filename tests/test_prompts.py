@@ -0,0 +1,52 @@
+"""Tests for brain.prompts."""
+import itertools
+
+import pytest
+
+from brain.prompts import PromptTemplate
+
+
+def make_template(changelog=lambda: "v1"):
+    clock = itertools.count()
+    return PromptTemplate(
+        "{intro}\n{changelog}\n---\n{memory}\n{time}\n{message}",
+        sections={"intro": "Hello, Tai!", "changelog": changelog},
+        defaults={"time": lambda: f"time {next(clock)}"},
+    )
+
+
+def test_static_prefix_is_the_same_across_renders():
+    template = make_template()
+    first_prefix, first_rest = template.split(memory="m1", message="hi")
+    second_prefix, second_rest = template.split(memory="m2", message="bye")
+    assert first_prefix == second_prefix == template.static_prefix == "Hello, Tai!\nv1\n---\n"
+    assert first_rest == "m1\ntime 0\nhi"
+    assert second_rest == "m2\ntime 1\nbye"
+
+
+def test_render_joins_prefix_and_rest():
+    template = make_template()
+    assert template.render(memory="m", message="hi") == "Hello, Tai!\nv1\n---\nm\ntime 0\nhi"
+    assert template.slots == ["memory", "time", "message"]
+
+
+def test_callable_section_recompiles_only_when_it_changes():
+    versions = ["v1"]
+    template = make_template(changelog=lambda: versions[-1])
+    template.render(memory="m", message="hi")
+    parts = template._parts
+    template.render(memory="m", message="hi")
+    assert template._parts is parts
+
+    versions.append("v2")
+    assert template.static_prefix == "Hello, Tai!\nv2\n---\n"
+    assert template._parts is not parts
+
+
+def test_missing_slot_raises():
+    with pytest.raises(ValueError):
+        make_template().render(memory="m")
+
+
+def test_explicit_value_overrides_default():
+    assert make_template().render(memory="m", message="hi", time="noon").endswith("m\nnoon\nhi")
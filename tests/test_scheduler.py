@@ -0,0 +1,51 @@
+"""Tests for brain.scheduler."""
+import threading
+
+import pytest
+
+from brain.scheduler import StageScheduler
+
+
+def test_passes_dependency_results_as_keyword_arguments():
+    scheduler = StageScheduler()
+    scheduler.add_stage("initial", lambda: 2)
+    scheduler.add_stage("double", lambda initial: initial * 2, after=["initial"])
+    scheduler.add_stage("total", lambda initial, double: initial + double, after=["initial", "double"])
+    assert scheduler.run() == {"initial": 2, "double": 4, "total": 6}
+    assert set(scheduler.timings) == {"initial", "double", "total"}
+
+
+def test_runs_independent_stages_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    scheduler = StageScheduler()
+    scheduler.add_stage("left", lambda: barrier.wait() is not None)
+    scheduler.add_stage("right", lambda: barrier.wait() is not None)
+    assert scheduler.run() == {"left": True, "right": True}
+
+
+def test_first_error_stops_dependent_stages():
+    started = []
+
+    def fail():
+        raise RuntimeError("boom")
+
+    scheduler = StageScheduler()
+    scheduler.add_stage("initial", fail)
+    scheduler.add_stage("followup", lambda initial: started.append(initial), after=["initial"])
+    with pytest.raises(RuntimeError, match="boom"):
+        scheduler.run()
+    assert started == []
+
+
+def test_rejects_unknown_dependencies_cycles_and_duplicates():
+    scheduler = StageScheduler().add_stage("a", lambda: None, after=["missing"])
+    with pytest.raises(ValueError, match="unknown stage"):
+        scheduler.run()
+
+    scheduler = StageScheduler()
+    scheduler.add_stage("a", lambda b: None, after=["b"]).add_stage("b", lambda a: None, after=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        scheduler.run()
+
+    with pytest.raises(ValueError, match="already registered"):
+        StageScheduler().add_stage("a", lambda: None).add_stage("a", lambda: None)
@@ -0,0 +1,51 @@
+"""Tests for brain.scrape_cache."""
+import time
+
+from brain.scrape_cache import ScrapeCache, expiry_from_headers, normalize_url
+
+
+def test_normalize_url_merges_trivially_different_spellings():
+    assert normalize_url("HTTPS://Example.COM:443/docs?b=2&a=1&utm_source=x#intro") == "https://example.com/docs?a=1&b=2"
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("http://example.com:8080/?fbclid=abc") == "http://example.com:8080/"
+
+
+def test_expiry_follows_cache_headers():
+    assert expiry_from_headers({"Cache-Control": "no-store"}, 100, 60) is None
+    assert expiry_from_headers({"Cache-Control": "no-cache"}, 100, 60) == 100
+    assert expiry_from_headers({"Cache-Control": "public, max-age=30"}, 100, 60) == 130
+    assert expiry_from_headers({"Expires": "Thu, 01 Jan 1970 00:01:40 GMT"}, 50, 60) == 100
+    assert expiry_from_headers({}, 100, 60) == 160
+
+
+def test_put_and_get_share_normalized_urls(tmp_path):
+    cache = ScrapeCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("https://example.com/page?utm_medium=mail", "hello", {"ETag": '"v1"'})
+    page = cache.get("https://EXAMPLE.com/page")
+    assert page.text == "hello"
+    assert page.etag == '"v1"'
+    assert page.is_fresh()
+    assert cache.put("https://example.com/private", "secret", {"Cache-Control": "no-store"}) is None
+    assert cache.get("https://example.com/private") is None
+
+
+def test_refresh_makes_a_stale_entry_fresh_again(tmp_path):
+    cache = ScrapeCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("https://example.com", "hello", {"Cache-Control": "no-cache"})
+    assert not cache.get("https://example.com").is_fresh()
+    cache.refresh("https://example.com", {"Cache-Control": "max-age=60"})
+    assert cache.get("https://example.com").is_fresh()
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    cache = ScrapeCache(str(tmp_path / "cache.sqlite3"), max_bytes=10)
+    cache.put("https://example.com/a", "aaaa")
+    time.sleep(0.01)
+    cache.put("https://example.com/b", "bbbb")
+    time.sleep(0.01)
+    cache.get("https://example.com/a")
+    time.sleep(0.01)
+    cache.put("https://example.com/c", "cccc")
+    assert cache.get("https://example.com/a") is not None
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/c") is not None